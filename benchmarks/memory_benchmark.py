@@ -0,0 +1,138 @@
+"""Peak memory benchmark for large Collibra list responses.
+
+Serves a synthetic ``/assets`` response from a local HTTP server process and
+measures the peak RSS of fetching it, in a fresh subprocess per mode:
+
+- ``json``: the original path, ``requests.get().json()`` followed by ``str()``.
+- ``stream``: ``mcp_get_records`` with incremental parsing into AssetRecords,
+  followed by ``str()``.
+
+Usage:
+    python benchmarks/memory_benchmark.py [--assets 10000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_body(count):
+    """Builds a /assets response body shaped like Collibra's."""
+    results = []
+    for i in range(count):
+        results.append({
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "createdBy": "00000000-0000-0000-0000-000000000001",
+            "createdOn": 1700000000000 + i,
+            "lastModifiedBy": "00000000-0000-0000-0000-000000000001",
+            "lastModifiedOn": 1700000000000 + i,
+            "system": False,
+            "resourceType": "Asset",
+            "name": f"column_{i}",
+            "displayName": f"column_{i}",
+            "articulationScore": 0.0,
+            "excludedFromAutoHyperlinking": False,
+            "domain": {"id": "00000000-0000-0000-0000-0000000000d1", "resourceType": "Domain", "name": "Warehouse"},
+            "type": {"id": "00000000-0000-0000-0000-000000031008", "resourceType": "AssetType", "name": "Column"},
+            "status": {"id": "00000000-0000-0000-0000-000000005008", "resourceType": "Status", "name": "Candidate"},
+            "avgRating": 0.0,
+            "ratingsCount": 0,
+        })
+    return json.dumps({"total": count, "offset": 0, "limit": 0, "results": results}).encode()
+
+
+def serve(count):
+    """Serves a body of ``count`` assets for every GET and prints the port."""
+    body = make_body(count)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    print(server.server_port, len(body), flush=True)
+    server.serve_forever()
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, url):
+    """Fetches ``url`` in the given mode and prints baseline and peak RSS."""
+    import requests
+    from collibra_mcp.helper_functions import mcp_get_records
+    from collibra_mcp.records import AssetRecord
+
+    baseline = peak_rss_mb()
+    if mode == "json":
+        result = requests.get(url).json()
+    else:
+        result = mcp_get_records(url, AssetRecord)
+    text = str(result)
+    print(json.dumps({
+        "mode": mode,
+        "records": len(result["results"]),
+        "chars": len(text),
+        "baseline_mb": round(baseline, 1),
+        "peak_mb": round(peak_rss_mb(), 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", choices=["json", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.url)
+        return
+    if args.serve:
+        serve(args.assets)
+        return
+
+    # The server runs in its own process so the measured processes are not
+    # forked from one that holds the response body (ru_maxrss survives exec).
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--assets", str(args.assets)],
+        stdout=subprocess.PIPE, text=True, env=env,
+    )
+    try:
+        port, size = server.stdout.readline().split()
+        url = f"http://127.0.0.1:{port}/assets"
+        print(f"{args.assets} assets, {int(size) / 1e6:.1f} MB response body")
+        for mode in ("json", "stream"):
+            deltas = []
+            for _ in range(args.repeat):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--mode", mode, "--url", url],
+                    check=True, capture_output=True, text=True, env=env,
+                ).stdout
+                sample = json.loads(output.strip().splitlines()[-1])
+                deltas.append(sample["peak_mb"] - sample["baseline_mb"])
+            print(f"{mode:>6}: peak RSS above baseline {min(deltas):.1f} MB (best of {args.repeat})")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Asset type hierarchy for Collibra MCP.
+
+This module loads the full Collibra asset type catalog once per instance and
+precomputes indexes over it so that lookups by id, publicId or name, and
+expansion of a type to all of its subtypes, can be answered locally without
+extra API calls.
+
+Descendants are stored using interval encoding: the types are numbered in
+depth-first pre-order, so every subtree occupies a contiguous slice
+``[start, end)`` of that order.
+"""
+
+import logging
+import time
+
+from collibra_mcp.config import ASSET_TYPE_CACHE_TTL_SECONDS
+from collibra_mcp.instances import current_instance
+from collibra_mcp.helper_functions import mcp_get_request
+from collibra_mcp.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Page size used when loading the asset type catalog
+PAGE_SIZE = 1000
+
+
+class AssetTypeHierarchy:
+    """
+    Precomputed, read-only view of the Collibra asset type hierarchy.
+
+    Args:
+        asset_types: Iterable of asset type dicts as returned by the
+            ``/assetTypes`` endpoint (``id``, ``publicId``, ``name`` and an
+            optional ``parent`` reference).
+    """
+
+    __slots__ = (
+        "ids", "public_ids", "names", "parents", "children",
+        "start", "end", "by_id", "by_public_id", "by_name",
+    )
+
+    def __init__(self, asset_types):
+        ids, public_ids, names, parent_ids = [], [], [], []
+        for asset_type in asset_types:
+            ids.append(asset_type["id"])
+            public_ids.append(asset_type.get("publicId"))
+            names.append(asset_type.get("name"))
+            parent = asset_type.get("parent") or {}
+            parent_ids.append(parent.get("id"))
+
+        index = {type_id: i for i, type_id in enumerate(ids)}
+        children = [[] for _ in ids]
+        roots = []
+        for i, parent_id in enumerate(parent_ids):
+            if parent_id in index and parent_id != ids[i]:
+                children[index[parent_id]].append(i)
+            else:
+                roots.append(i)
+
+        # Depth-first pre-order walk; an iterative stack avoids recursion
+        # limits on deep hierarchies.
+        order, start, end = [], [0] * len(ids), [0] * len(ids)
+        for root in roots:
+            stack = [(root, False)]
+            while stack:
+                node, done = stack.pop()
+                if done:
+                    end[node] = len(order)
+                    continue
+                start[node] = len(order)
+                order.append(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children[node]))
+
+        # Renumber everything into pre-order so a subtree is a plain slice
+        position = {node: pos for pos, node in enumerate(order)}
+        self.ids = tuple(ids[node] for node in order)
+        self.public_ids = tuple(public_ids[node] for node in order)
+        self.names = tuple(names[node] for node in order)
+        self.parents = tuple(
+            position[index[parent_ids[node]]] if parent_ids[node] in index and parent_ids[node] != ids[node] else -1
+            for node in order
+        )
+        self.children = tuple(tuple(position[child] for child in children[node]) for node in order)
+        self.start = tuple(start[node] for node in order)
+        self.end = tuple(end[node] for node in order)
+        self.by_id = {type_id: pos for pos, type_id in enumerate(self.ids)}
+        self.by_public_id = {pid: pos for pos, pid in enumerate(self.public_ids) if pid}
+        self.by_name = {name.lower(): pos for pos, name in enumerate(self.names) if name}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _position(self, key):
+        """Resolves an id, publicId or (case-insensitive) name to a position."""
+        if key in self.by_id:
+            return self.by_id[key]
+        if key in self.by_public_id:
+            return self.by_public_id[key]
+        if isinstance(key, str):
+            return self.by_name.get(key.lower())
+        return None
+
+    def get(self, key):
+        """
+        Looks up an asset type by id, publicId or name.
+
+        Returns:
+            A dict with id, publicId, name and parentId, or None if unknown.
+        """
+        pos = self._position(key)
+        if pos is None:
+            return None
+        parent = self.parents[pos]
+        return {
+            "id": self.ids[pos],
+            "publicId": self.public_ids[pos],
+            "name": self.names[pos],
+            "parentId": self.ids[parent] if parent >= 0 else None,
+        }
+
+    def get_id(self, key):
+        """Returns the asset type id for an id, publicId or name, or None."""
+        pos = self._position(key)
+        return None if pos is None else self.ids[pos]
+
+    def parent_id(self, key):
+        """Returns the id of the parent asset type, or None for a root type."""
+        pos = self._position(key)
+        if pos is None or self.parents[pos] < 0:
+            return None
+        return self.ids[self.parents[pos]]
+
+    def child_ids(self, key):
+        """Returns the ids of the direct subtypes of an asset type."""
+        pos = self._position(key)
+        if pos is None:
+            return []
+        return [self.ids[child] for child in self.children[pos]]
+
+    def descendant_ids(self, key, include_self=True):
+        """
+        Returns the ids of all transitive subtypes of an asset type.
+
+        Args:
+            key: The id, publicId or name of the asset type.
+            include_self: Whether to include the type itself (default: True).
+        """
+        pos = self._position(key)
+        if pos is None:
+            return []
+        first = self.start[pos] if include_self else self.start[pos] + 1
+        return list(self.ids[first:self.end[pos]])
+
+    def is_subtype(self, key, ancestor_key):
+        """Returns True if ``key`` is ``ancestor_key`` or one of its subtypes."""
+        pos = self._position(key)
+        ancestor = self._position(ancestor_key)
+        if pos is None or ancestor is None:
+            return False
+        return self.start[ancestor] <= pos < self.end[ancestor]
+
+    def expand(self, keys):
+        """
+        Expands asset type filters to include all of their subtypes.
+
+        Unknown keys are passed through unchanged so the Collibra API can
+        still validate them. Order is preserved and duplicates are removed.
+        """
+        expanded = {}
+        for key in keys:
+            pos = self._position(key)
+            if pos is None:
+                expanded.setdefault(key, None)
+                continue
+            for type_id in self.ids[self.start[pos]:self.end[pos]]:
+                expanded.setdefault(type_id, None)
+        return list(expanded)
+
+
+def fetch_asset_types():
+    """
+    Retrieves the full asset type catalog from Collibra, following pagination.
+
+    Returns:
+        A list of asset type dicts, or a dict with error information.
+    """
+    asset_types = []
+    offset = 0
+    while True:
+        api_url = f'{current_instance().base_url}/assetTypes?offset={offset}&limit={PAGE_SIZE}'
+        response_json = mcp_get_request(api_url)
+
+        if isinstance(response_json, dict) and response_json.get("error"):
+            return response_json
+
+        results = response_json.get('results', []) if isinstance(response_json, dict) else []
+        asset_types.extend(results)
+        offset += len(results)
+        if len(results) < PAGE_SIZE:
+            return asset_types
+
+
+def get_asset_type_hierarchy(refresh=False):
+    """
+    Returns the current instance's asset type hierarchy, loading it on first use.
+
+    The cached hierarchy is reloaded once it is older than
+    ASSET_TYPE_CACHE_TTL_SECONDS, so new asset types are picked up without
+    a restart. If that reload fails, the cached hierarchy keeps being served
+    and the reload is retried on the next call.
+
+    Args:
+        refresh: Reload the catalog from Collibra even if it is cached.
+
+    Returns:
+        An AssetTypeHierarchy, or a dict with error information if the
+        catalog could not be loaded and nothing is cached, or if an
+        explicit refresh failed.
+    """
+    instance = current_instance()
+    with instance.asset_type_lock:
+        now = time.monotonic()
+        expired = (instance.asset_type_loaded_at is None
+                   or now - instance.asset_type_loaded_at >= ASSET_TYPE_CACHE_TTL_SECONDS)
+        if instance.asset_type_hierarchy is None or expired or refresh:
+            with span("asset_types.load") as load_span:
+                asset_types = fetch_asset_types()
+                if isinstance(asset_types, dict):
+                    if refresh or instance.asset_type_hierarchy is None:
+                        return asset_types
+                    logger.warning(
+                        f"Reloading asset types of instance '{instance.name}' failed, "
+                        f"serving the cached hierarchy: {asset_types.get('error')}"
+                    )
+                    load_span.set(stale=True)
+                    return instance.asset_type_hierarchy
+                instance.asset_type_hierarchy = AssetTypeHierarchy(asset_types)
+                instance.asset_type_loaded_at = now
+                load_span.set(asset_types=len(instance.asset_type_hierarchy))
+        return instance.asset_type_hierarchy
@@ -1,7 +1,8 @@
 """Configuration module for Collibra MCP.
 
 This module centralizes all Collibra configuration variables including
-the base URL and authentication credentials.
+the base URL and authentication credentials, and the set of named Collibra
+instances the server can talk to.
 """
 
 import os
@@ -13,3 +14,71 @@ COLLIBRA_BASE_URL = '<YOUR COLLIBRA URL>'
 USERNAME = os.getenv('COLLIBRA_ADMIN_USN')
 PASSWORD = os.getenv('COLLIBRA_ADMIN_PW')
 
+# Maximum number of tool calls allowed to run against Collibra at once
+MAX_CONCURRENT_REQUESTS = int(os.getenv('COLLIBRA_MAX_CONCURRENT_REQUESTS', '8'))
+
+# Slots of the limit above that only interactive lookups may use, so bulk reads
+# can never occupy every connection
+RESERVED_INTERACTIVE_SLOTS = int(os.getenv('COLLIBRA_RESERVED_INTERACTIVE_SLOTS', '2'))
+
+# Result paging: large list results are returned in pages of at most this many
+# characters (COLLIBRA_RESULT_PAGE_TOKENS, if set, is converted at ~4 chars per token)
+_page_tokens = os.getenv('COLLIBRA_RESULT_PAGE_TOKENS')
+RESULT_PAGE_CHARS = int(_page_tokens) * 4 if _page_tokens else int(os.getenv('COLLIBRA_RESULT_PAGE_CHARS', '20000'))
+
+# Bounds for the server-side result store behind fetch_more cursors
+RESULT_STORE_TTL_SECONDS = int(os.getenv('COLLIBRA_RESULT_TTL_SECONDS', '600'))
+RESULT_STORE_MAX_ENTRIES = int(os.getenv('COLLIBRA_RESULT_STORE_SIZE', '32'))
+RESULT_STORE_MAX_RECORDS = int(os.getenv('COLLIBRA_RESULT_STORE_MAX_RECORDS', '200000'))
+
+# Tracing: finished traces are appended to COLLIBRA_TRACE_FILE (JSONL) and/or
+# sent to an OTLP/HTTP collector, e.g. http://localhost:4318
+TRACE_FILE = os.getenv('COLLIBRA_TRACE_FILE')
+TRACE_OTLP_ENDPOINT = os.getenv('COLLIBRA_TRACE_OTLP_ENDPOINT')
+
+# Tool calls slower than this have their span tree logged (0 disables)
+SLOW_CALL_THRESHOLD_MS = float(os.getenv('COLLIBRA_SLOW_CALL_MS', '5000'))
+
+# Seconds before the cached asset type hierarchy is reloaded from Collibra
+ASSET_TYPE_CACHE_TTL_SECONDS = int(os.getenv('COLLIBRA_ASSET_TYPE_CACHE_TTL_SECONDS', '3600'))
+
+# Named Collibra instances, e.g. COLLIBRA_INSTANCES=dev,test,prod. Each instance
+# requires COLLIBRA_<NAME>_BASE_URL, COLLIBRA_<NAME>_USN and COLLIBRA_<NAME>_PW and
+# optionally reads COLLIBRA_<NAME>_MAX_CONCURRENT_REQUESTS. Named instances never
+# fall back to the global settings, so a missing variable cannot route one
+# tenant's calls to another. Without COLLIBRA_INSTANCES a single "default"
+# instance uses the base URL and credentials above.
+def _instance_settings(name):
+    if ':' in name:
+        raise ValueError(f"Collibra instance name '{name}' in COLLIBRA_INSTANCES must not contain ':'")
+    prefix = f'COLLIBRA_{name.upper()}_'
+    settings = {
+        "base_url": os.getenv(prefix + 'BASE_URL'),
+        "username": os.getenv(prefix + 'USN'),
+        "password": os.getenv(prefix + 'PW'),
+    }
+    missing = [prefix + suffix for suffix, key in (('BASE_URL', 'base_url'), ('USN', 'username'), ('PW', 'password'))
+               if not settings[key]]
+    if missing:
+        raise ValueError(
+            f"Collibra instance '{name}' listed in COLLIBRA_INSTANCES is missing "
+            f"required environment variable(s): {', '.join(missing)}"
+        )
+    settings["max_concurrent_requests"] = int(os.getenv(prefix + 'MAX_CONCURRENT_REQUESTS', MAX_CONCURRENT_REQUESTS))
+    return settings
+
+_instance_names = [name.strip() for name in os.getenv('COLLIBRA_INSTANCES', '').split(',') if name.strip()]
+if _instance_names:
+    INSTANCES = {name: _instance_settings(name) for name in _instance_names}
+else:
+    INSTANCES = {
+        "default": {
+            "base_url": COLLIBRA_BASE_URL,
+            "username": USERNAME,
+            "password": PASSWORD,
+            "max_concurrent_requests": MAX_CONCURRENT_REQUESTS,
+        }
+    }
+
+# Instance used by tools called without an instance selector
+DEFAULT_INSTANCE = os.getenv('COLLIBRA_DEFAULT_INSTANCE') or next(iter(INSTANCES))
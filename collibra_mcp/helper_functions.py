@@ -3,8 +3,12 @@
 This module contains utility and helper functions used across the Collibra MCP package.
 """
 
-import requests
-from collibra_mcp.config import USERNAME, PASSWORD
+from collibra_mcp.instances import current_instance
+from collibra_mcp.streaming import iter_json_results
+from collibra_mcp.tracing import http_span, span
+
+# Size of the chunks read from streamed list responses
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 def mcp_get_request(api_url, success_status_codes=None, **kwargs):
@@ -14,7 +18,7 @@ def mcp_get_request(api_url, success_status_codes=None, **kwargs):
     Args:
         api_url: The full API URL to make the request to.
         success_status_codes: List of status codes considered successful (default: [200]).
-        **kwargs: Additional arguments to pass to requests.get() (e.g., headers, params).
+        **kwargs: Additional arguments to pass to Session.get() (e.g., headers, params).
     
     Returns:
         On success: response.json() or parsed response data
@@ -24,16 +28,19 @@ def mcp_get_request(api_url, success_status_codes=None, **kwargs):
         success_status_codes = [200, 201, 202, 204]
     
     try:
-        # Automatically add authentication
-        response = requests.get(
-            api_url,
-            auth=(USERNAME, PASSWORD),
-            headers={'Content-Type': 'application/json'},
-            **kwargs
-        )
+        # The instance's session adds authentication and pools connections
+        instance = current_instance()
+        with http_span("GET", api_url, instance) as request_span:
+            response = instance.session.get(
+                api_url,
+                headers={'Content-Type': 'application/json'},
+                **kwargs
+            )
+            request_span.record_response(response)
         
         if response.status_code in success_status_codes:
-            return response.json()
+            with span("json.parse"):
+                return response.json()
         else:
             return {
                 "error": f"Request failed. Status code: {response.status_code}",
@@ -52,7 +59,7 @@ def mcp_post_request(api_url, payload=None, success_status_codes=None, **kwargs)
         api_url: The full API URL to make the request to.
         payload: JSON payload to send in the request body (default: None).
         success_status_codes: List of status codes considered successful (default: [200, 201]).
-        **kwargs: Additional arguments to pass to requests.post() (e.g., headers).
+        **kwargs: Additional arguments to pass to Session.post() (e.g., headers).
     
     Returns:
         On success: response.json() or parsed response data
@@ -62,16 +69,19 @@ def mcp_post_request(api_url, payload=None, success_status_codes=None, **kwargs)
         success_status_codes = [200, 201]
     
     try:
-        # Automatically add authentication
-        response = requests.post(
-            api_url,
-            json=payload,
-            auth=(USERNAME, PASSWORD),
-            **kwargs
-        )
+        # The instance's session adds authentication and pools connections
+        instance = current_instance()
+        with http_span("POST", api_url, instance) as request_span:
+            response = instance.session.post(
+                api_url,
+                json=payload,
+                **kwargs
+            )
+            request_span.record_response(response)
         
         if response.status_code in success_status_codes:
-            return response.json()
+            with span("json.parse"):
+                return response.json()
         else:
             error_response = {
                 "error": f"Request failed. Status code: {response.status_code}",
@@ -93,7 +103,7 @@ def mcp_put_request(api_url, payload=None, success_status_codes=None, **kwargs):
         api_url: The full API URL to make the request to.
         payload: JSON payload to send in the request body (default: None).
         success_status_codes: List of status codes considered successful (default: [200, 201]).
-        **kwargs: Additional arguments to pass to requests.put() (e.g., headers).
+        **kwargs: Additional arguments to pass to Session.put() (e.g., headers).
     
     Returns:
         On success: response.json() or parsed response data
@@ -103,16 +113,19 @@ def mcp_put_request(api_url, payload=None, success_status_codes=None, **kwargs):
         success_status_codes = [200, 201]
     
     try:
-        # Automatically add authentication
-        response = requests.put(
-            api_url,
-            json=payload,
-            auth=(USERNAME, PASSWORD),
-            **kwargs
-        )
+        # The instance's session adds authentication and pools connections
+        instance = current_instance()
+        with http_span("PUT", api_url, instance) as request_span:
+            response = instance.session.put(
+                api_url,
+                json=payload,
+                **kwargs
+            )
+            request_span.record_response(response)
         
         if response.status_code in success_status_codes:
-            return response.json()
+            with span("json.parse"):
+                return response.json()
         else:
             error_response = {
                 "error": f"Request failed. Status code: {response.status_code}",
@@ -134,7 +147,7 @@ def mcp_patch_request(api_url, payload=None, success_status_codes=None, **kwargs
         api_url: The full API URL to make the request to.
         payload: JSON payload to send in the request body (default: None).
         success_status_codes: List of status codes considered successful (default: [200, 201]).
-        **kwargs: Additional arguments to pass to requests.patch() (e.g., headers).
+        **kwargs: Additional arguments to pass to Session.patch() (e.g., headers).
     
     Returns:
         On success: response.json() or parsed response data
@@ -144,16 +157,19 @@ def mcp_patch_request(api_url, payload=None, success_status_codes=None, **kwargs
         success_status_codes = [200, 201]
     
     try:
-        # Automatically add authentication
-        response = requests.patch(
-            api_url,
-            json=payload,
-            auth=(USERNAME, PASSWORD),
-            **kwargs
-        )
+        # The instance's session adds authentication and pools connections
+        instance = current_instance()
+        with http_span("PATCH", api_url, instance) as request_span:
+            response = instance.session.patch(
+                api_url,
+                json=payload,
+                **kwargs
+            )
+            request_span.record_response(response)
         
         if response.status_code in success_status_codes:
-            return response.json()
+            with span("json.parse"):
+                return response.json()
         else:
             error_response = {
                 "error": f"Request failed. Status code: {response.status_code}",
@@ -174,7 +190,7 @@ def mcp_delete_request(api_url, success_status_codes=None, **kwargs):
     Args:
         api_url: The full API URL to make the request to.
         success_status_codes: List of status codes considered successful (default: [200, 204]).
-        **kwargs: Additional arguments to pass to requests.delete() (e.g., headers).
+        **kwargs: Additional arguments to pass to Session.delete() (e.g., headers).
     
     Returns:
         On success: response.json() if response has content, otherwise success message
@@ -184,17 +200,20 @@ def mcp_delete_request(api_url, success_status_codes=None, **kwargs):
         success_status_codes = [200, 204]
     
     try:
-        # Automatically add authentication
-        response = requests.delete(
-            api_url,
-            auth=(USERNAME, PASSWORD),
-            **kwargs
-        )
+        # The instance's session adds authentication and pools connections
+        instance = current_instance()
+        with http_span("DELETE", api_url, instance) as request_span:
+            response = instance.session.delete(
+                api_url,
+                **kwargs
+            )
+            request_span.record_response(response)
         
         if response.status_code in success_status_codes:
             # Some DELETE requests return empty body
             if response.text:
-                return response.json()
+                with span("json.parse"):
+                    return response.json()
             else:
                 return {"success": f"Successfully deleted resource. Status code: {response.status_code}"}
         else:
@@ -206,3 +225,89 @@ def mcp_delete_request(api_url, success_status_codes=None, **kwargs):
     except Exception as e:
         return {"error": f"Error making DELETE request: {str(e)}"}
 
+
+
+def _stream_records(method, api_url, record_type, success_status_codes=None, **kwargs):
+    """
+    Makes a request to a Collibra list endpoint and parses the response incrementally.
+    
+    The body is read in chunks and each entry of ``results`` is converted to
+    ``record_type`` as soon as it is parsed, so neither the raw body nor the
+    full list of dicts is ever held in memory.
+    
+    Returns:
+        On success: dict with the envelope fields (e.g. total) and a list of records under "results"
+        On failure: dict with error information including status_code and response text
+    """
+    if success_status_codes is None:
+        success_status_codes = [200]
+    
+    try:
+        # The instance's session adds authentication and pools connections
+        instance = current_instance()
+        with http_span(method, api_url, instance) as request_span, instance.session.request(
+            method,
+            api_url,
+            stream=True,
+            **kwargs
+        ) as response:
+            request_span.set(**{
+                "http.status_code": response.status_code,
+                "http.time_to_headers_ms": round(response.elapsed.total_seconds() * 1000, 3),
+            })
+            if response.status_code not in success_status_codes:
+                return {
+                    "error": f"Request failed. Status code: {response.status_code}",
+                    "status_code": response.status_code,
+                    "response": response.text
+                }
+            
+            result = {}
+            chunks = request_span.count_bytes(response.iter_content(STREAM_CHUNK_SIZE))
+            # Download and parsing are interleaved, so this span covers both
+            with span("json.stream_parse", record_type=record_type.__name__) as parse_span:
+                records = [
+                    record_type.from_json(item)
+                    for item in iter_json_results(chunks, result)
+                ]
+                parse_span.set(records=len(records))
+            result["results"] = records
+            return result
+    except Exception as e:
+        return {"error": f"Error making {method} request: {str(e)}"}
+
+
+def mcp_get_records(api_url, record_type, success_status_codes=None, **kwargs):
+    """
+    Streaming variant of mcp_get_request for list endpoints.
+    
+    Args:
+        api_url: The full API URL to make the request to.
+        record_type: Record class from collibra_mcp.records used to hold each result.
+        success_status_codes: List of status codes considered successful (default: [200]).
+        **kwargs: Additional arguments to pass to instance.session.request() (e.g., params).
+    
+    Returns:
+        On success: dict with the envelope fields and a list of records under "results"
+        On failure: dict with error information including status_code and response text
+    """
+    return _stream_records("GET", api_url, record_type, success_status_codes,
+                           headers={'Content-Type': 'application/json'}, **kwargs)
+
+
+def mcp_post_records(api_url, record_type, payload=None, success_status_codes=None, **kwargs):
+    """
+    Streaming variant of mcp_post_request for list endpoints such as /search.
+    
+    Args:
+        api_url: The full API URL to make the request to.
+        record_type: Record class from collibra_mcp.records used to hold each result.
+        payload: JSON payload to send in the request body (default: None).
+        success_status_codes: List of status codes considered successful (default: [200]).
+        **kwargs: Additional arguments to pass to instance.session.request() (e.g., headers).
+    
+    Returns:
+        On success: dict with the envelope fields and a list of records under "results"
+        On failure: dict with error information including status_code and response text
+    """
+    return _stream_records("POST", api_url, record_type, success_status_codes, json=payload, **kwargs)
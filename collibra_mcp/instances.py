@@ -0,0 +1,122 @@
+"""Collibra instances for Collibra MCP.
+
+One server can manage several named Collibra instances (for example dev, test
+and prod). Each instance owns everything that must not be shared between
+tenants: its base URL and credentials, an HTTP connection pool, a scheduler
+with its own concurrency limits, the result store behind ``fetch_more``
+cursors and the asset type hierarchy cache.
+
+The instance a tool call runs against is kept in a context variable, so the
+tool implementations, helpers and caches pick it up through
+``current_instance()`` without it being passed through every function.
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from collibra_mcp.config import (
+    DEFAULT_INSTANCE,
+    INSTANCES,
+    RESERVED_INTERACTIVE_SLOTS,
+    RESULT_PAGE_CHARS,
+    RESULT_STORE_MAX_ENTRIES,
+    RESULT_STORE_MAX_RECORDS,
+    RESULT_STORE_TTL_SECONDS,
+)
+from collibra_mcp.result_store import ResultStore
+from collibra_mcp.scheduler import TOOL_LIMITS, TOOL_PRIORITIES, Scheduler
+
+
+class CollibraInstance:
+    """
+    A named Collibra instance with its own connection pool, limits and caches.
+
+    Args:
+        name: The name tools use to select the instance.
+        base_url: Collibra REST API base URL.
+        username: Username for basic authentication.
+        password: Password for basic authentication.
+        max_concurrent_requests: Maximum number of concurrent tool calls, also
+            used as the size of the connection pool.
+    """
+
+    def __init__(self, name, base_url, username, password, max_concurrent_requests):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+
+        self.session = requests.Session()
+        self.session.auth = (username, password)
+        adapter = HTTPAdapter(pool_maxsize=max_concurrent_requests)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.scheduler = Scheduler(
+            max_concurrent_requests,
+            TOOL_LIMITS,
+            TOOL_PRIORITIES,
+            RESERVED_INTERACTIVE_SLOTS,
+        )
+        self.result_store = ResultStore(
+            RESULT_PAGE_CHARS,
+            RESULT_STORE_TTL_SECONDS,
+            RESULT_STORE_MAX_ENTRIES,
+            RESULT_STORE_MAX_RECORDS,
+            prefix=f'{name}:',
+        )
+        self.asset_type_hierarchy = None
+        self.asset_type_loaded_at = None
+        self.asset_type_lock = threading.Lock()
+
+
+_instances = {
+    name: CollibraInstance(name, **settings)
+    for name, settings in INSTANCES.items()
+}
+
+if DEFAULT_INSTANCE not in _instances:
+    raise ValueError(
+        f"COLLIBRA_DEFAULT_INSTANCE '{DEFAULT_INSTANCE}' is not one of the configured "
+        f"instances: {', '.join(_instances)}"
+    )
+
+_current_instance = contextvars.ContextVar("collibra_mcp_instance", default=None)
+
+
+def instance_names():
+    """Returns the names of all configured instances."""
+    return list(_instances)
+
+
+def get_instance(name=None):
+    """
+    Returns the instance with the given name, or the default instance if no name is given.
+
+    Returns:
+        The CollibraInstance, or None if no instance has that name.
+    """
+    return _instances.get(name or DEFAULT_INSTANCE)
+
+
+def instance_for_cursor(cursor):
+    """Returns the instance whose result store issued ``cursor``, or None."""
+    name, separator, _ = cursor.partition(':')
+    return _instances.get(name) if separator else None
+
+
+def current_instance():
+    """Returns the instance selected for the current tool call, or the default instance."""
+    return _current_instance.get() or _instances[DEFAULT_INSTANCE]
+
+
+@contextmanager
+def use_instance(instance):
+    """Selects ``instance`` for the enclosed block, including work it hands to worker threads."""
+    token = _current_instance.set(instance)
+    try:
+        yield instance
+    finally:
+        _current_instance.reset(token)
@@ -0,0 +1,144 @@
+"""Compact record types for Collibra MCP.
+
+Large list responses are converted into these ``__slots__`` records instead
+of being kept as the nested dicts returned by the API. Each record keeps only
+the fields the tools report, flattens nested references (``type``,
+``domain``, ...) into plain attributes and interns the strings that repeat
+across many records, such as type and domain names.
+"""
+
+from sys import intern
+
+
+def _ref(value, key):
+    """Returns ``value[key]`` for a nested reference dict, or None."""
+    if isinstance(value, dict):
+        return value.get(key)
+    return None
+
+
+def _interned(value):
+    return intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """Base class for compact records."""
+
+    __slots__ = ()
+
+    def as_dict(self):
+        """Returns the populated fields of the record as a dict."""
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                result[name] = value
+        return result
+
+    def __repr__(self):
+        return repr(self.as_dict())
+
+
+class AssetRecord(Record):
+    """An asset from the ``/assets`` endpoint."""
+
+    __slots__ = ("id", "name", "display_name", "type_id", "type_name",
+                 "domain_id", "domain_name", "status")
+
+    def __init__(self, id, name=None, display_name=None, type_id=None, type_name=None,
+                 domain_id=None, domain_name=None, status=None):
+        self.id = id
+        self.name = name
+        self.display_name = display_name if display_name != name else None
+        self.type_id = _interned(type_id)
+        self.type_name = _interned(type_name)
+        self.domain_id = _interned(domain_id)
+        self.domain_name = _interned(domain_name)
+        self.status = _interned(status)
+
+    @classmethod
+    def from_json(cls, item):
+        return cls(
+            item.get("id"),
+            item.get("name"),
+            item.get("displayName"),
+            _ref(item.get("type"), "id"),
+            _ref(item.get("type"), "name"),
+            _ref(item.get("domain"), "id"),
+            _ref(item.get("domain"), "name"),
+            _ref(item.get("status"), "name"),
+        )
+
+
+class AttributeRecord(Record):
+    """An attribute from the ``/attributes`` endpoint."""
+
+    __slots__ = ("id", "type_id", "type_name", "asset_id", "value")
+
+    def __init__(self, id, type_id=None, type_name=None, asset_id=None, value=None):
+        self.id = id
+        self.type_id = _interned(type_id)
+        self.type_name = _interned(type_name)
+        self.asset_id = _interned(asset_id)
+        self.value = value
+
+    @classmethod
+    def from_json(cls, item):
+        return cls(
+            item.get("id"),
+            _ref(item.get("type"), "id"),
+            _ref(item.get("type"), "name"),
+            _ref(item.get("asset"), "id"),
+            item.get("value"),
+        )
+
+
+class RelationRecord(Record):
+    """A relation from the ``/relations`` endpoint."""
+
+    __slots__ = ("id", "type_id", "source_id", "source_name", "target_id", "target_name")
+
+    def __init__(self, id, type_id=None, source_id=None, source_name=None,
+                 target_id=None, target_name=None):
+        self.id = id
+        self.type_id = _interned(type_id)
+        self.source_id = _interned(source_id)
+        self.source_name = _interned(source_name)
+        self.target_id = _interned(target_id)
+        self.target_name = _interned(target_name)
+
+    @classmethod
+    def from_json(cls, item):
+        return cls(
+            item.get("id"),
+            _ref(item.get("type"), "id"),
+            _ref(item.get("source"), "id"),
+            _ref(item.get("source"), "name"),
+            _ref(item.get("target"), "id"),
+            _ref(item.get("target"), "name"),
+        )
+
+
+class SearchRecord(Record):
+    """A hit from the ``/search`` endpoint."""
+
+    __slots__ = ("id", "name", "resource_type", "type_name", "domain_name")
+
+    def __init__(self, id, name=None, resource_type=None, type_name=None, domain_name=None):
+        self.id = id
+        self.name = name
+        self.resource_type = _interned(resource_type)
+        self.type_name = _interned(type_name)
+        self.domain_name = _interned(domain_name)
+
+    @classmethod
+    def from_json(cls, item):
+        resource = item.get("resource") or {}
+        asset_type = resource.get("assetType") or resource.get("type")
+        return cls(
+            resource.get("id"),
+            resource.get("name") or resource.get("displayName"),
+            resource.get("resourceType"),
+            _ref(asset_type, "name") or (asset_type if isinstance(asset_type, str) else None),
+            _ref(resource.get("domain"), "name"),
+        )
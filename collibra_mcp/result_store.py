@@ -0,0 +1,158 @@
+"""Server-side result cursors for Collibra MCP.
+
+Large list results are kept in a bounded, TTL-evicted store instead of being
+dumped into the model's context in one go. Tools return a first page sized to
+a character budget together with a cursor, and ``fetch_more(cursor)`` serves
+the following pages from the stored result without calling Collibra again.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class _StoredResult:
+    __slots__ = ("metadata", "records", "expires_at")
+
+    def __init__(self, metadata, records, expires_at):
+        self.metadata = metadata
+        self.records = records
+        self.expires_at = expires_at
+
+
+class ResultStore:
+    """
+    Holds large results behind cursors and serves them a page at a time.
+
+    A cursor names a stored result and a fixed position in it
+    (``<id>:<offset>``), so reading a cursor again returns the same page and
+    each page carries a new cursor for the next one. Reads never remove a
+    result. Instead the store is bounded by number of results and total
+    number of records; the least recently used results are evicted first,
+    and results that have not been read for ``ttl`` seconds expire.
+
+    Args:
+        page_chars: Character budget for a single page.
+        ttl: Seconds a result stays available after it was last read.
+        max_entries: Maximum number of stored results.
+        max_records: Maximum number of records held across all results. A
+            single result larger than this is not stored; its first page is
+            returned with a note that the rest was dropped.
+        prefix: Prepended to every cursor, e.g. to name the instance that owns it.
+    """
+
+    def __init__(self, page_chars, ttl, max_entries, max_records, prefix=''):
+        self.prefix = prefix
+        self.page_chars = page_chars
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_records = max_records
+        self.entries = OrderedDict()
+        self.record_count = 0
+        self.lock = threading.Lock()
+
+    def _evict(self, now, keep=None):
+        """Drops expired results, then least recently used ones until within bounds, never ``keep``."""
+        for result_id in [r for r, entry in self.entries.items() if entry.expires_at <= now and r != keep]:
+            self._drop(result_id)
+        for result_id in list(self.entries):
+            if len(self.entries) <= self.max_entries and self.record_count <= self.max_records:
+                break
+            if result_id != keep:
+                self._drop(result_id)
+
+    def _drop(self, result_id):
+        entry = self.entries.pop(result_id)
+        self.record_count -= len(entry.records)
+
+    def _page(self, records, offset):
+        """Returns the end offset of the page starting at ``offset``."""
+        used = 0
+        end = offset
+        while end < len(records):
+            # Always return at least one record, even if it exceeds the budget
+            size = len(repr(records[end])) + 2
+            if end > offset and used + size > self.page_chars:
+                break
+            used += size
+            end += 1
+        return end
+
+    def _format(self, metadata, records, offset, end, cursor=None, note=None):
+        page = dict(metadata)
+        page["results"] = records[offset:end]
+        returned = f"{offset + 1}-{end} of {len(records)} fetched" if end > offset else f"0 of {len(records)} fetched"
+        total = metadata.get("total")
+        if isinstance(total, int) and total != len(records):
+            returned += f" (Collibra reports {total} in total)"
+            if cursor is None and note is None:
+                note = (f"Only {len(records)} of {total} results were fetched from Collibra, "
+                        f"narrow the query to see the rest")
+        page["returned"] = returned
+        if cursor:
+            page["cursor"] = cursor
+            note = note or "More results available, call fetch_more with this cursor"
+        if note:
+            page["note"] = note
+        return str(page)
+
+    def paginate(self, result):
+        """
+        Returns the first page of a list result, storing the rest behind a cursor.
+
+        Results that are not a ``{"results": [...]}`` dict and error responses
+        are returned in full.
+        """
+        if not isinstance(result, dict) or result.get("error") or not isinstance(result.get("results"), list):
+            return str(result)
+
+        records = result["results"]
+        metadata = {key: value for key, value in result.items() if key != "results"}
+        end = self._page(records, 0)
+        if end >= len(records):
+            return self._format(metadata, records, 0, end)
+        if len(records) > self.max_records:
+            return self._format(metadata, records, 0, end, note=(
+                f"Result truncated: only records 1-{end} of {len(records)} are shown, the result is "
+                f"larger than the result store limit of {self.max_records} records, narrow the query"
+            ))
+
+        result_id = self.prefix + secrets.token_urlsafe(12)
+        with self.lock:
+            now = time.monotonic()
+            self.entries[result_id] = _StoredResult(metadata, records, now + self.ttl)
+            self.record_count += len(records)
+            self._evict(now, keep=result_id)
+        return self._format(metadata, records, 0, end, f"{result_id}:{end}")
+
+    def fetch_more(self, cursor):
+        """
+        Returns the page a cursor points to.
+
+        Reading the same cursor again returns the same page, so a retried
+        call never skips records.
+
+        Returns:
+            The formatted page, or a dict with error information if the
+            cursor is malformed, unknown or has expired.
+        """
+        result_id, _, offset = cursor.rpartition(':')
+        if not result_id or not offset.isdigit():
+            return {"error": f"Cursor '{cursor}' is not a valid cursor"}
+        offset = int(offset)
+
+        with self.lock:
+            now = time.monotonic()
+            self._evict(now)
+            entry = self.entries.get(result_id)
+            if entry is None:
+                return {"error": f"Cursor '{cursor}' not found or expired"}
+            entry.expires_at = now + self.ttl
+            self.entries.move_to_end(result_id)
+
+        if offset >= len(entry.records):
+            return {"error": f"Cursor '{cursor}' is past the end of the result"}
+        end = self._page(entry.records, offset)
+        next_cursor = f"{result_id}:{end}" if end < len(entry.records) else None
+        return self._format(entry.metadata, entry.records, offset, end, next_cursor)
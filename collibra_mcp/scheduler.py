@@ -0,0 +1,241 @@
+"""Tool call scheduler for Collibra MCP.
+
+This module sits in front of the request layer and decides when a tool call
+may start talking to Collibra. It enforces a global cap on concurrent
+upstream work, per-tool concurrency caps, and priority classes so cheap
+interactive lookups are not stuck behind bulk reads: interactive calls are
+admitted first, and a number of slots is reserved for them that bulk work
+may never take. Within a priority
+class, waiting calls are served round-robin across MCP sessions so one busy
+session cannot starve the others.
+
+Tool functions are synchronous, so once a call is admitted it runs in a
+worker thread and the event loop stays free to accept other calls.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+
+import anyio
+
+from collibra_mcp.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, lower values are served first
+INTERACTIVE = 0
+BULK = 1
+
+# Tools that can return very large results are scheduled as bulk work
+TOOL_PRIORITIES = {
+    "get_collibra_assets": BULK,
+    "get_relations": BULK,
+    "search_collibra_assets": BULK,
+    "get_attributes": BULK,
+    "get_attribute": BULK,
+}
+
+# Maximum number of concurrent calls per tool, tools not listed are only
+# bounded by the global limit
+TOOL_LIMITS = {
+    "get_collibra_assets": 2,
+    "get_relations": 2,
+    "search_collibra_assets": 2,
+    "get_attributes": 2,
+    "get_attribute": 2,
+}
+
+
+class ToolStats:
+    """Accumulated timings for a single tool."""
+
+    __slots__ = ("calls", "queue_wait", "upstream", "max_queue_wait", "max_upstream")
+
+    def __init__(self):
+        self.calls = 0
+        self.queue_wait = 0.0
+        self.upstream = 0.0
+        self.max_queue_wait = 0.0
+        self.max_upstream = 0.0
+
+    def record(self, queue_wait, upstream):
+        self.calls += 1
+        self.queue_wait += queue_wait
+        self.upstream += upstream
+        self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+        self.max_upstream = max(self.max_upstream, upstream)
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "avg_queue_wait_ms": round(1000 * self.queue_wait / self.calls, 3) if self.calls else 0.0,
+            "avg_upstream_ms": round(1000 * self.upstream / self.calls, 3) if self.calls else 0.0,
+            "max_queue_wait_ms": round(1000 * self.max_queue_wait, 3),
+            "max_upstream_ms": round(1000 * self.max_upstream, 3),
+        }
+
+
+class Scheduler:
+    """
+    Admits tool calls according to priority, per-tool caps and session fairness.
+
+    All bookkeeping happens on the event loop thread, so no locking is needed.
+
+    Args:
+        max_concurrent: Maximum number of tool calls running at once.
+        tool_limits: Mapping of tool name to its own concurrency cap.
+        tool_priorities: Mapping of tool name to priority class (default: INTERACTIVE).
+        reserved_interactive: Number of slots only INTERACTIVE calls may use.
+            Bulk work as a whole is capped at ``max_concurrent - reserved_interactive``
+            (at least one slot).
+    """
+
+    def __init__(self, max_concurrent, tool_limits=None, tool_priorities=None, reserved_interactive=0):
+        self.max_concurrent = max_concurrent
+        self.tool_limits = dict(tool_limits or {})
+        self.tool_priorities = dict(tool_priorities or {})
+        self.bulk_limit = max(1, max_concurrent - reserved_interactive)
+        self.running = 0
+        self.running_bulk = 0
+        self.running_by_tool = {}
+        # priority -> OrderedDict(session -> deque of (tool_name, future))
+        self.queues = {}
+        self.stats = {}
+        # Worker threads are bounded per scheduler so one instance's calls
+        # never wait on another instance's threads
+        self.limiter = None
+
+    def _priority(self, tool_name):
+        return self.tool_priorities.get(tool_name, INTERACTIVE)
+
+    def _has_capacity(self, tool_name):
+        if self.running >= self.max_concurrent:
+            return False
+        if self._priority(tool_name) != INTERACTIVE and self.running_bulk >= self.bulk_limit:
+            return False
+        limit = self.tool_limits.get(tool_name)
+        return limit is None or self.running_by_tool.get(tool_name, 0) < limit
+
+    def _start(self, tool_name):
+        self.running += 1
+        if self._priority(tool_name) != INTERACTIVE:
+            self.running_bulk += 1
+        self.running_by_tool[tool_name] = self.running_by_tool.get(tool_name, 0) + 1
+
+    def _release(self, tool_name):
+        self.running -= 1
+        if self._priority(tool_name) != INTERACTIVE:
+            self.running_bulk -= 1
+        self.running_by_tool[tool_name] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Wakes as many waiting calls as current capacity allows."""
+        for priority in sorted(self.queues):
+            sessions = self.queues[priority]
+            # Round-robin: each pass offers one slot per session, in turn,
+            # and a served session moves to the back of the line.
+            progressed = True
+            while sessions and progressed and self.running < self.max_concurrent:
+                progressed = False
+                for session in list(sessions):
+                    waiters = sessions[session]
+                    # A waiter cancelled in this loop tick is still queued
+                    # until its own cleanup runs, it must not be admitted
+                    for entry in [entry for entry in waiters if entry[1].done()]:
+                        waiters.remove(entry)
+                    if not waiters:
+                        del sessions[session]
+                        continue
+                    for i, (tool_name, future) in enumerate(waiters):
+                        if self._has_capacity(tool_name):
+                            del waiters[i]
+                            self._start(tool_name)
+                            future.set_result(None)
+                            progressed = True
+                            if waiters:
+                                sessions.move_to_end(session)
+                            else:
+                                del sessions[session]
+                            break
+                    if self.running >= self.max_concurrent:
+                        break
+            if not sessions:
+                del self.queues[priority]
+            if self.running >= self.max_concurrent:
+                return
+
+    def _remove_waiter(self, priority, session, entry):
+        sessions = self.queues.get(priority)
+        if not sessions or session not in sessions:
+            return
+        try:
+            sessions[session].remove(entry)
+        except ValueError:
+            return
+        if not sessions[session]:
+            del sessions[session]
+        if not sessions:
+            del self.queues[priority]
+
+    async def _acquire(self, tool_name, session):
+        priority = self._priority(tool_name)
+        future = asyncio.get_running_loop().create_future()
+        entry = (tool_name, future)
+        self.queues.setdefault(priority, OrderedDict()).setdefault(session, deque()).append(entry)
+        # Always go through dispatch so a new call never jumps ahead of
+        # waiters of the same or higher priority.
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just before cancellation, hand the slot back
+                self._release(tool_name)
+            else:
+                self._remove_waiter(priority, session, entry)
+            raise
+
+    async def run(self, tool_name, fn, *args, session=None):
+        """
+        Runs a synchronous tool function once the scheduler admits it.
+
+        Args:
+            tool_name: The name of the MCP tool, used for caps, priority and stats.
+            fn: The synchronous function to call.
+            *args: Positional arguments for ``fn``.
+            session: Key identifying the calling MCP session, for fairness.
+
+        Returns:
+            The return value of ``fn``.
+        """
+        queued_at = time.perf_counter()
+        with span("scheduler.wait", priority=self._priority(tool_name)):
+            await self._acquire(tool_name, session)
+        started_at = time.perf_counter()
+        try:
+            if self.limiter is None:
+                self.limiter = anyio.CapacityLimiter(self.max_concurrent)
+            return await anyio.to_thread.run_sync(fn, *args, limiter=self.limiter)
+        finally:
+            finished_at = time.perf_counter()
+            self._release(tool_name)
+            queue_wait = started_at - queued_at
+            upstream = finished_at - started_at
+            self.stats.setdefault(tool_name, ToolStats()).record(queue_wait, upstream)
+            logger.info(
+                f"{tool_name}: queue wait {queue_wait * 1000:.1f} ms, upstream {upstream * 1000:.1f} ms"
+            )
+
+    def snapshot(self):
+        """Returns current queue depth, running calls and per-tool timing stats."""
+        return {
+            "running": self.running,
+            "running_bulk": self.running_bulk,
+            "running_by_tool": {name: n for name, n in self.running_by_tool.items() if n},
+            "queued": sum(len(w) for s in self.queues.values() for w in s.values()),
+            "tools": {name: stats.as_dict() for name, stats in self.stats.items()},
+        }
+
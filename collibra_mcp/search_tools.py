@@ -1,28 +1,35 @@
 """Search tools for Collibra MCP."""
-import requests
 from pprint import pformat
 import os
 import base64
 
-from collibra_mcp.config import COLLIBRA_BASE_URL, USERNAME, PASSWORD
+from collibra_mcp.instances import current_instance
+from collibra_mcp.helper_functions import mcp_post_records
+from collibra_mcp.records import SearchRecord
+from collibra_mcp.asset_types import get_asset_type_hierarchy
 
-def search_collibra_assets(keyword, asset_type_id):
+def search_collibra_assets(keyword, asset_type_id, include_subtypes=False):
     """
     Searches for assets in Collibra.
     
     Args:
         keyword: The search keyword to use.
         asset_type_id: The asset type ID to filter by.
+        include_subtypes: Also match assets of any subtype of the asset type (default: False).
     """
-    api_url = f'{COLLIBRA_BASE_URL}/search'
+    api_url = f'{current_instance().base_url}/search'
+    asset_type_ids = [asset_type_id]
+    if include_subtypes:
+        hierarchy = get_asset_type_hierarchy()
+        if isinstance(hierarchy, dict) and hierarchy.get("error"):
+            return hierarchy
+        asset_type_ids = hierarchy.expand(asset_type_ids)
     payload = {
         "keywords": keyword,
         "filters": [
             {
                 "field": "assetType",
-                "values": [
-                    asset_type_id
-                ]
+                "values": asset_type_ids
             }
         ],
         "sortField": "RELEVANCE",
@@ -31,12 +38,4 @@ def search_collibra_assets(keyword, asset_type_id):
         "offset": 0,
         "product": "ALL"
     }
-    response = requests.post(api_url, json=payload, auth=(USERNAME, PASSWORD))
-    if response.status_code == 200:
-        return response.json()
-    else:
-        return {
-            "error": f"Failed to search Collibra assets. Status code: {response.status_code}",
-            "status_code": response.status_code,
-            "response": response.text
-        }
+    return mcp_post_records(api_url, SearchRecord, payload)
@@ -1,8 +1,17 @@
+import functools
 import logging
 from typing import Annotated
 from mcp.server.fastmcp import FastMCP
 from collibra_mcp import tools
 from collibra_mcp import search_tools
+from collibra_mcp.instances import (
+    current_instance,
+    get_instance,
+    instance_for_cursor,
+    instance_names,
+    use_instance,
+)
+from collibra_mcp.tracing import current_span, span, traced_tool
 # Configure logging
 logging.basicConfig(
     level=logging.WARNING,
@@ -12,10 +21,60 @@ logger = logging.getLogger(__name__)
 
 mcp = FastMCP("collibra-mcp")
 
+# Selector accepted by every tool, see tool()
+InstanceName = Annotated[str, "Optional: The name of the Collibra instance to use"]
 
-@mcp.tool()
-def get_collibra_assets(
-    domain_id: Annotated[str, "The domain ID to filter Collibra assets by"]
+
+def _session_key():
+    """Returns a key identifying the calling MCP session, or None outside a request."""
+    try:
+        return id(mcp.get_context().session)
+    except (LookupError, ValueError):
+        return None
+
+
+def tool():
+    """
+    Registers an MCP tool whose invocations are traced as root spans.
+
+    Every tool takes an optional ``instance`` argument. The call runs with that
+    Collibra instance selected (the default instance if it is omitted), so its
+    scheduler, connection pool, result store and caches are used throughout.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, instance=None, **kwargs):
+            target = get_instance(instance)
+            # Tag the root span so slow-call trees can be told apart by tenant
+            current_span().set(**{"collibra.instance": target.name if target else instance})
+            if target is None:
+                return str({
+                    "error": f"Unknown Collibra instance '{instance}'. "
+                             f"Available instances: {', '.join(instance_names())}"
+                })
+            with use_instance(target):
+                return await fn(*args, instance=instance, **kwargs)
+        return mcp.tool()(traced_tool(wrapper))
+    return decorator
+
+
+def _to_text(result, paged=False):
+    """Serializes a tool result, paging large list results through the instance's result store."""
+    with span("serialize") as serialize_span:
+        text = current_instance().result_store.paginate(result) if paged else str(result)
+        serialize_span.set(chars=len(text))
+    return text
+
+
+async def _schedule(tool_name, fn, *args):
+    """Runs a tool implementation through the instance's scheduler on behalf of the current session."""
+    return await current_instance().scheduler.run(tool_name, fn, *args, session=_session_key())
+
+
+@tool()
+async def get_collibra_assets(
+    domain_id: Annotated[str, "The domain ID to filter Collibra assets by"],
+    instance: InstanceName = None
 ) -> str:
     """
     Retrieves assets from Collibra for a given domain.
@@ -24,16 +83,17 @@ def get_collibra_assets(
         domain_id: The domain ID to filter assets by.
     
     Returns:
-        A list of Collibra assets or an error message.
+        A page of Collibra assets, with a cursor for fetch_more if there are more, or an error message.
     """
     logger.info(f"Retrieving Collibra assets for domain {domain_id}")
-    result = tools.get_collibra_assets(domain_id)
+    result = await _schedule("get_collibra_assets", tools.get_collibra_assets, domain_id)
     logger.info(f"Successfully retrieved Collibra assets")
-    return str(result)
+    return _to_text(result, paged=True)
 
-@mcp.tool()
-def get_collibra_domains(
-    domain_name: Annotated[str, "The domain name to search for in Collibra"]
+@tool()
+async def get_collibra_domains(
+    domain_name: Annotated[str, "The domain name to search for in Collibra"],
+    instance: InstanceName = None
 ) -> str:
     """
     Retrieves domains from Collibra by name.
@@ -45,226 +105,291 @@ def get_collibra_domains(
         A list of Collibra domains or an error message.
     """
     logger.info(f"Retrieving Collibra domains for name {domain_name}")
-    result = tools.get_collibra_domains(domain_name)
+    result = await _schedule("get_collibra_domains", tools.get_collibra_domains, domain_name)
     logger.info(f"Successfully retrieved Collibra domains")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def add_collibra_domain(
+@tool()
+async def add_collibra_domain(
     domain_name: Annotated[str, "The name of the domain to add"],
     community_id: Annotated[str, "The community ID to add the domain to"],
-    type_id: Annotated[str, "The type ID of the domain to add"]
+    type_id: Annotated[str, "The type ID of the domain to add"],
+    instance: InstanceName = None
 ) -> str:
     """
     Adds a new domain to Collibra.
     """
     logger.info(f"Adding Collibra domain {domain_name} to community {community_id} with type {type_id}")
-    result = tools.add_collibra_domain(domain_name, community_id, type_id)
+    result = await _schedule("add_collibra_domain", tools.add_collibra_domain, domain_name, community_id, type_id)
     logger.info(f"Successfully added Collibra domain")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def add_collibra_asset(
+@tool()
+async def add_collibra_asset(
     asset_name: Annotated[str, "The name of the asset to add"],
     asset_type: Annotated[str, "The type of the asset to add"],
     domain_id: Annotated[str, "The domain ID to add the asset to"],
-    owner_id: Annotated[str, "Optional: The owner ID to assign to the asset"] = None
+    owner_id: Annotated[str, "Optional: The owner ID to assign to the asset"] = None,
+    instance: InstanceName = None
 ) -> str:
     """
     Adds a new asset to Collibra.
     """
     logger.info(f"Adding Collibra asset {asset_name} to domain {domain_id} with type {asset_type}")
-    result = tools.add_collibra_asset(asset_name, asset_type, domain_id, owner_id)
+    result = await _schedule("add_collibra_asset", tools.add_collibra_asset, asset_name, asset_type, domain_id, owner_id)
     logger.info(f"Successfully added Collibra asset")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def get_community_id(
-    community_name: Annotated[str, "The name of the community to search for"]
+@tool()
+async def get_community_id(
+    community_name: Annotated[str, "The name of the community to search for"],
+    instance: InstanceName = None
 ) -> str:
     """
     Retrieves the community ID from Collibra by name.
     """
     logger.info(f"Retrieving community ID for {community_name}")
-    result = tools.get_community_id(community_name)
+    result = await _schedule("get_community_id", tools.get_community_id, community_name)
     logger.info(f"Successfully retrieved community ID")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def add_collibra_community(
-    community_name: Annotated[str, "The name of the community to create"]
+@tool()
+async def add_collibra_community(
+    community_name: Annotated[str, "The name of the community to create"],
+    instance: InstanceName = None
 ) -> str:
     """
     Creates a new community in Collibra.
     """
     logger.info(f"Creating Collibra community {community_name}")
-    result = tools.add_collibra_community(community_name)
+    result = await _schedule("add_collibra_community", tools.add_collibra_community, community_name)
     logger.info(f"Successfully created Collibra community")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def get_domain_type_id(
-    domain_name: Annotated[str, "The name of the domain type to search for"]
+@tool()
+async def get_domain_type_id(
+    domain_name: Annotated[str, "The name of the domain type to search for"],
+    instance: InstanceName = None
 ) -> str:
     """
     Retrieves the domain type ID from Collibra by name.
     """
     logger.info(f"Retrieving domain type ID for {domain_name}")
-    result = tools.get_domain_type_id(domain_name)
+    result = await _schedule("get_domain_type_id", tools.get_domain_type_id, domain_name)
     logger.info(f"Successfully retrieved domain type ID")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def get_asset_type_id(
-    asset_type_name: Annotated[str, "The name of the asset type to search for"]
+@tool()
+async def get_asset_type_id(
+    asset_type_name: Annotated[str, "The name of the asset type to search for"],
+    instance: InstanceName = None
 ) -> str:
     """
     Retrieves the asset type ID from Collibra by name.
     """
     logger.info(f"Retrieving asset type ID for {asset_type_name}")
-    result = tools.get_asset_type_id(asset_type_name)
+    result = await _schedule("get_asset_type_id", tools.get_asset_type_id, asset_type_name)
     logger.info(f"Successfully retrieved asset type ID")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def get_user_id(
-    username: Annotated[str, "The username to search for"]
+@tool()
+async def get_user_id(
+    username: Annotated[str, "The username to search for"],
+    instance: InstanceName = None
 ) -> str:
     """
     Retrieves the user ID from Collibra by username.
     """
     logger.info(f"Retrieving user ID for {username}")
-    result = tools.get_user_id(username)
+    result = await _schedule("get_user_id", tools.get_user_id, username)
     logger.info(f"Successfully retrieved user ID")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def assign_steward(
+@tool()
+async def assign_steward(
     resource_id: Annotated[str, "The ID of the resource to assign a steward to"],
     owner_id: Annotated[str, "The ID of the user to assign as steward"],
     role_id: Annotated[str, "The ID of the role to assign as steward"],
-    resource_type: Annotated[str, "The type of the resource to assign a steward to"]
+    resource_type: Annotated[str, "The type of the resource to assign a steward to"],
+    instance: InstanceName = None
 ) -> str:
     """
     Assigns a Data Steward to an asset.
     """
     logger.info(f"Assigning steward {owner_id} to resource {resource_id}")
-    result = tools.assign_steward(resource_id, owner_id, role_id, resource_type)
+    result = await _schedule("assign_steward", tools.assign_steward, resource_id, owner_id, role_id, resource_type)
     logger.info(f"Successfully assigned steward")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def get_role_id(
-    role_name: Annotated[str, "The name of the role to search for"]
+@tool()
+async def get_role_id(
+    role_name: Annotated[str, "The name of the role to search for"],
+    instance: InstanceName = None
 ) -> str:
     """
     Retrieves the role ID from Collibra by name.
     """
     logger.info(f"Retrieving role ID for {role_name}")
-    result = tools.get_role_id(role_name)
+    result = await _schedule("get_role_id", tools.get_role_id, role_name)
     logger.info(f"Successfully retrieved role ID")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def get_asset_types():
+@tool()
+async def get_asset_types(instance: InstanceName = None):
     """
     Retrieves all asset types from Collibra.
     """
     logger.info(f"Retrieving all asset types")
-    result = tools.get_asset_types()
+    result = await _schedule("get_asset_types", tools.get_asset_types)
     logger.info(f"Successfully retrieved all asset types")
-    return str(result)
+    return _to_text(result)
 
 
-@mcp.tool()
-def get_relations(sourceAssetId, targetAssetId):
+@tool()
+async def get_asset_subtypes(
+    asset_type: Annotated[str, "The ID, publicId or name of the asset type"],
+    refresh: Annotated[bool, "Optional: Reload the asset type catalog from Collibra first, e.g. after adding asset types"] = False,
+    instance: InstanceName = None
+) -> str:
+    """
+    Retrieves an asset type and the IDs of all of its subtypes from Collibra.
+    """
+    logger.info(f"Retrieving subtypes for asset type {asset_type}")
+    result = await _schedule("get_asset_subtypes", tools.get_asset_subtypes, asset_type, refresh)
+    logger.info(f"Successfully retrieved asset subtypes")
+    return _to_text(result)
+
+
+@tool()
+async def get_relations(sourceAssetId, targetAssetId, instance: InstanceName = None):
     """
     Retrieves all relations from Collibra.
     """
     logger.info(f"Retrieving all relations")
-    result = tools.get_relations(sourceAssetId, targetAssetId)
+    result = await _schedule("get_relations", tools.get_relations, sourceAssetId, targetAssetId)
     logger.info(f"Successfully retrieved all relations")
-    return str(result)
+    return _to_text(result, paged=True)
 
-@mcp.tool()
-def get_relation_types():
+@tool()
+async def get_relation_types(instance: InstanceName = None):
     """
     Retrieves all relation types from Collibra.
     """
     logger.info(f"Retrieving all relation types")
-    result = tools.get_relation_types()
+    result = await _schedule("get_relation_types", tools.get_relation_types)
     logger.info(f"Successfully retrieved all relation types")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def get_relation_type_id(relation_type_name):
+@tool()
+async def get_relation_type_id(relation_type_name, instance: InstanceName = None):
     """
     Retrieves the relation type ID from Collibra by name.
     """
     logger.info(f"Retrieving relation type ID for {relation_type_name}")
-    result = tools.get_relation_type_id(relation_type_name)
+    result = await _schedule("get_relation_type_id", tools.get_relation_type_id, relation_type_name)
     logger.info(f"Successfully retrieved relation type ID")
-    return str(result)
+    return _to_text(result)
     
-@mcp.tool()
-def search_collibra_assets(keyword: Annotated[str, "The keyword to search for"], asset_type_id: Annotated[str, "The asset type ID to search for"]) -> str   :
+@tool()
+async def search_collibra_assets(
+    keyword: Annotated[str, "The keyword to search for"],
+    asset_type_id: Annotated[str, "The asset type ID to search for"],
+    include_subtypes: Annotated[bool, "Optional: Also match assets of any subtype of the asset type"] = False,
+    instance: InstanceName = None
+) -> str:
     """
     Searches for assets in Collibra.
     """
     logger.info(f"Searching for assets with keyword {keyword} and asset type ID {asset_type_id}")
-    result = search_tools.search_collibra_assets(keyword, asset_type_id)
+    result = await _schedule("search_collibra_assets", search_tools.search_collibra_assets, keyword, asset_type_id, include_subtypes)
     logger.info(f"Successfully searched for assets")
-    return str(result)
+    return _to_text(result, paged=True)
     
-@mcp.tool()
-def get_attributes(assetId, typeId):
+@tool()
+async def get_attributes(assetId, typeId, instance: InstanceName = None):
     """
     Retrieves the asset attributes from Collibra.
     """
     logger.info(f"Retrieving asset attributes for asset {assetId} and type IDs {typeId}")
-    result = tools.get_attributes(assetId, typeId)
+    result = await _schedule("get_attributes", tools.get_attributes, assetId, typeId)
     logger.info(f"Successfully retrieved asset attributes")
-    return str(result)
+    return _to_text(result, paged=True)
 
-@mcp.tool()
-def add_attribute(assetId, attributeId, value):
+@tool()
+async def add_attribute(assetId, attributeId, value, instance: InstanceName = None):
     """
     Adds an attribute to an asset in Collibra.
     """
     logger.info(f"Adding attribute {attributeId} to asset {assetId} with value {value}")
-    result = tools.add_attribute(assetId, attributeId, value)
+    result = await _schedule("add_attribute", tools.add_attribute, assetId, attributeId, value)
     logger.info(f"Successfully added attribute")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def change_attribute(attributeId, value):
+@tool()
+async def change_attribute(attributeId, value, instance: InstanceName = None):
     """
     Changes an attribute value in Collibra.
     """
     logger.info(f"Changing attribute {attributeId} value to {value}")
-    result = tools.change_attribute(attributeId, value)
+    result = await _schedule("change_attribute", tools.change_attribute, attributeId, value)
     logger.info(f"Successfully changed attribute")
-    return str(result)
+    return _to_text(result)
 
-@mcp.tool()
-def get_attribute_id(attribute_name):
+@tool()
+async def get_attribute_id(attribute_name, instance: InstanceName = None):
     """
     Retrieves the attribute ID from Collibra by name.
     """
     logger.info(f"Retrieving attribute ID for {attribute_name}")
-    result = tools.get_attribute_id(attribute_name)
+    result = await _schedule("get_attribute_id", tools.get_attribute_id, attribute_name)
     logger.info(f"Successfully retrieved attribute ID")
-    return str(result)
+    return _to_text(result, paged=True)
 
-@mcp.tool()
-def get_attribute(assetId, typeIds):
+@tool()
+async def get_attribute(assetId, typeIds, instance: InstanceName = None):
     """
     Retrieves the attributes from an asset in Collibra.
     """
     logger.info(f"Retrieving attributes for asset {assetId} and type IDs {typeIds}")
-    result = tools.get_attributes(assetId, typeIds)
+    result = await _schedule("get_attribute", tools.get_attributes, assetId, typeIds)
     logger.info(f"Successfully retrieved attributes")
-    return str(result)
+    return _to_text(result, paged=True)
+
+@mcp.tool()
+@traced_tool
+async def fetch_more(
+    cursor: Annotated[str, "The cursor returned with a previous page of results"]
+) -> str:
+    """
+    Retrieves the page of a large result that a cursor points to, without calling Collibra again.
+    The cursor identifies the Collibra instance it came from.
+    """
+    logger.info(f"Fetching page for cursor {cursor}")
+    target = instance_for_cursor(cursor)
+    if target is None:
+        return str({"error": f"Cursor '{cursor}' does not belong to a configured Collibra instance"})
+    current_span().set(**{"collibra.instance": target.name})
+    with use_instance(target):
+        result = target.result_store.fetch_more(cursor)
+        logger.info(f"Successfully fetched page")
+        return _to_text(result)
+
+@tool()
+async def get_scheduler_stats(instance: InstanceName = None) -> str:
+    """
+    Retrieves scheduler statistics: running and queued calls, and per-tool queue wait and upstream times.
+    """
+    return str(current_instance().scheduler.snapshot())
+
+@mcp.tool()
+def list_collibra_instances() -> str:
+    """
+    Lists the configured Collibra instances that tools can select with their instance argument.
+    """
+    return str({
+        "default": get_instance().name,
+        "instances": {name: get_instance(name).base_url for name in instance_names()},
+    })
 
 def run_server():
     """Run the MCP server."""
@@ -0,0 +1,122 @@
+"""Incremental JSON parsing for Collibra MCP.
+
+Collibra list endpoints (``/assets``, ``/attributes``, ``/relations``,
+``/search``) return a paged envelope such as
+``{"total": 10000, "offset": 0, "limit": 0, "results": [...]}``. This module
+parses that envelope from a stream of byte chunks and yields the entries of
+``results`` one at a time, so the full response body is never held in memory
+as a single string or as a fully built Python structure.
+"""
+
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _ChunkReader:
+    """Buffers decoded text from an iterator of byte chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Appends the next chunk to the buffer, returns False once the stream is exhausted."""
+        if self.eof:
+            return False
+        for chunk in self.chunks:
+            text = self.text_decoder.decode(chunk)
+            if text:
+                # Drop consumed text so the buffer only holds the current value
+                self.buffer = self.buffer[self.pos:] + text
+                self.pos = 0
+                return True
+        self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(b'', final=True)
+        self.pos = 0
+        self.eof = True
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it, or '' at the end."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars):
+        """Consumes the next character, which must be one of ``chars``."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON stream, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_json_results(chunks, metadata=None):
+    """
+    Yields the entries of a Collibra paged response as they are parsed.
+
+    Args:
+        chunks: Iterable of raw byte chunks, e.g. ``response.iter_content()``.
+        metadata: Optional dict that receives the other top-level keys of the
+            envelope (``total``, ``offset``, ``limit``, ...).
+
+    Yields:
+        Each element of the ``results`` array, or of the top-level array if
+        the response body is a bare list.
+    """
+    reader = _ChunkReader(chunks)
+    if reader.peek() == '[':
+        yield from _iter_array(reader)
+        return
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'results' and reader.peek() == '[':
+            yield from _iter_array(reader)
+        else:
+            value = reader.value()
+            if metadata is not None:
+                metadata[key] = value
+        if reader.expect(',}') == '}':
+            return
+
+
+def _iter_array(reader):
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.expect(']')
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(',]') == ']':
+            return
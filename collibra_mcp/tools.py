@@ -1,11 +1,14 @@
 """MCP server tools implementation."""
 
-from collibra_mcp.config import COLLIBRA_BASE_URL
+from collibra_mcp.instances import current_instance
 from collibra_mcp.helper_functions import (
     mcp_get_request,
     mcp_post_request,
-    mcp_patch_request
+    mcp_patch_request,
+    mcp_get_records
     )
+from collibra_mcp.records import AssetRecord, AttributeRecord, RelationRecord
+from collibra_mcp.asset_types import get_asset_type_hierarchy
 
 def get_collibra_assets(domain_id):
     """
@@ -17,8 +20,8 @@ def get_collibra_assets(domain_id):
     Returns:
         A list of Collibra assets or an error message.
     """
-    api_url = f'{COLLIBRA_BASE_URL}/assets?domainId={domain_id}'
-    return mcp_get_request(api_url)
+    api_url = f'{current_instance().base_url}/assets?domainId={domain_id}'
+    return mcp_get_records(api_url, AssetRecord)
 
 def get_community_id(community_name):
     """
@@ -27,7 +30,7 @@ def get_community_id(community_name):
     Args:
         community_name: The name of the community to search for.
     """
-    api_url = f'{COLLIBRA_BASE_URL}/communities?name={community_name}'
+    api_url = f'{current_instance().base_url}/communities?name={community_name}'
     response_json = mcp_get_request(api_url)
 
     if isinstance(response_json, dict) and response_json.get("error"):
@@ -48,7 +51,7 @@ def get_collibra_domains(domain_name):
     Returns:
         A list of Collibra domains or an error message.
     """
-    api_url = f'{COLLIBRA_BASE_URL}/domains?name={domain_name}'
+    api_url = f'{current_instance().base_url}/domains?name={domain_name}'
     
     response_json = mcp_get_request(api_url)
 
@@ -60,7 +63,7 @@ def get_collibra_domains(domain_name):
     return {"error": f"Domain '{domain_name}' not found"}
 
 def add_collibra_domain(domain_name, community_id, type_id):
-    api_url = COLLIBRA_BASE_URL + "/domains"
+    api_url = current_instance().base_url + "/domains"
 
     payload = {
         "name": domain_name,
@@ -71,12 +74,12 @@ def add_collibra_domain(domain_name, community_id, type_id):
     return mcp_post_request(api_url, payload)
 
 def get_asset_attributes(assetId, typeIds):
-    api_url = f'{COLLIBRA_BASE_URL}/attributes?assetId={assetId}&typeIds={typeIds}&page=0&size=100'
-    return mcp_get_request(api_url)
+    api_url = f'{current_instance().base_url}/attributes?assetId={assetId}&typeIds={typeIds}&page=0&size=100'
+    return mcp_get_records(api_url, AttributeRecord)
 
 def add_collibra_asset(asset_name, asset_type, domain_id, owner_id=None):
 
-    api_url = COLLIBRA_BASE_URL + "/assets"
+    api_url = current_instance().base_url + "/assets"
     payload = {
         "name": asset_name,
         "typeId": asset_type,
@@ -101,7 +104,7 @@ def add_collibra_community(community_name):
     Returns:
         The created community or an error message.
     """
-    api_url = f'{COLLIBRA_BASE_URL}/communities'
+    api_url = f'{current_instance().base_url}/communities'
     payload = {
         "name": community_name
     }
@@ -115,7 +118,7 @@ def get_domain_type_id(domain_type_name):
     Args:
         domain_name: The name of the domain type to search for.
     """
-    api_url = f'{COLLIBRA_BASE_URL}/domainTypes?name={domain_type_name}'
+    api_url = f'{current_instance().base_url}/domainTypes?name={domain_type_name}'
     response_json = mcp_get_request(api_url)
 
     if isinstance(response_json, dict) and response_json.get("error"):
@@ -132,7 +135,7 @@ def get_asset_type_id(asset_type_name):
     Args:
         asset_type_name: The name of the asset type to search for.
     """
-    api_url = f'{COLLIBRA_BASE_URL}/assetTypes?name={asset_type_name}&nameMatchMode=EXACT'
+    api_url = f'{current_instance().base_url}/assetTypes?name={asset_type_name}&nameMatchMode=EXACT'
     response_json = mcp_get_request(api_url)
 
     if isinstance(response_json, dict) and response_json.get("error"):
@@ -152,7 +155,7 @@ def get_user_id(username):
     Returns:
         The user ID or an error message.
     """
-    api_url = f'{COLLIBRA_BASE_URL}/users?name={username}'
+    api_url = f'{current_instance().base_url}/users?name={username}'
     response_json = mcp_get_request(api_url)
 
     if isinstance(response_json, dict) and response_json.get("error"):
@@ -163,7 +166,7 @@ def get_user_id(username):
     return {"error": f"User '{username}' not found"}
 
 def get_role_id(role_name):
-    api_url = f'{COLLIBRA_BASE_URL}/roles?name={role_name}'
+    api_url = f'{current_instance().base_url}/roles?name={role_name}'
     response_json = mcp_get_request(api_url)
 
     if isinstance(response_json, dict) and response_json.get("error"):
@@ -187,7 +190,7 @@ def assign_steward(resource_id, owner_id, role_id, resource_type):
         Success message or error.
     """
     # use the responsibilities endpoint
-    api_url = f'{COLLIBRA_BASE_URL}/responsibilities'
+    api_url = f'{current_instance().base_url}/responsibilities'
     
     # Collibra expects TitleCase resource types
     
@@ -208,20 +211,42 @@ def assign_steward(resource_id, owner_id, role_id, resource_type):
     return {"success": f"Successfully assigned steward to {resource_type} {resource_id}"}
 
 def get_asset_types(asset_type_public_id):
-    api_url = f'{COLLIBRA_BASE_URL}/assetTypes/publicId/{asset_type_public_id}'
+    api_url = f'{current_instance().base_url}/assetTypes/publicId/{asset_type_public_id}'
     return mcp_get_request(api_url)
 
+def get_asset_subtypes(asset_type, refresh=False):
+    """
+    Retrieves an asset type and all of its transitive subtypes.
+    
+    Args:
+        asset_type: The ID, publicId or name of the asset type.
+        refresh: Reload the asset type catalog from Collibra first (default: False).
+    
+    Returns:
+        The asset type with its child and descendant IDs, or an error message.
+    """
+    hierarchy = get_asset_type_hierarchy(refresh)
+    if isinstance(hierarchy, dict) and hierarchy.get("error"):
+        return hierarchy
+
+    result = hierarchy.get(asset_type)
+    if result is None:
+        return {"error": f"Asset type '{asset_type}' not found"}
+    result["childIds"] = hierarchy.child_ids(asset_type)
+    result["descendantIds"] = hierarchy.descendant_ids(asset_type, include_self=False)
+    return result
+
 def get_relations(sourceAssetId, targetAssetId):
-    api_url = f'{COLLIBRA_BASE_URL}/relations?sourceAssetId={sourceAssetId}&targetAssetId={targetAssetId}'
-    return mcp_get_request(api_url)
+    api_url = f'{current_instance().base_url}/relations?sourceAssetId={sourceAssetId}&targetAssetId={targetAssetId}'
+    return mcp_get_records(api_url, RelationRecord)
 
 def get_relation_types(relationTypeId):
-    api_url = f'{COLLIBRA_BASE_URL}/relationTypes/publicId/{relationTypeId}'
+    api_url = f'{current_instance().base_url}/relationTypes/publicId/{relationTypeId}'
     
     return mcp_get_request(api_url)
     
 def add_attribute(assetId, attributeTypeId, value):
-    api_url = f'{COLLIBRA_BASE_URL}/attributes'
+    api_url = f'{current_instance().base_url}/attributes'
     payload = {
         "assetId": assetId,
         "attributeTypeId": attributeTypeId,
@@ -230,15 +255,15 @@ def add_attribute(assetId, attributeTypeId, value):
     return mcp_post_request(api_url, payload)
 
 def get_attribute_id(attribute_name):
-    api_url = f'{COLLIBRA_BASE_URL}/attributes?name={attribute_name}'
-    return mcp_get_request(api_url)
+    api_url = f'{current_instance().base_url}/attributes?name={attribute_name}'
+    return mcp_get_records(api_url, AttributeRecord)
 
 def get_attributes(assetId, typeId):
-    api_url = f'{COLLIBRA_BASE_URL}/attributes?assetId={assetId}&typeIds={typeId}&page=0&size=100'
-    return mcp_get_request(api_url)
+    api_url = f'{current_instance().base_url}/attributes?assetId={assetId}&typeIds={typeId}&page=0&size=100'
+    return mcp_get_records(api_url, AttributeRecord)
 
 def change_attribute(attributeId, value):
-    api_url = f'{COLLIBRA_BASE_URL}/attributes/{attributeId}'
+    api_url = f'{current_instance().base_url}/attributes/{attributeId}'
     payload = {
     "id": attributeId,
     "value": value
@@ -0,0 +1,283 @@
+"""Tracing for Collibra MCP.
+
+Every MCP tool invocation is recorded as a root span. Work done on its
+behalf (scheduler wait, HTTP requests made through ``helper_functions``, JSON
+parsing, loading the asset type hierarchy, serializing the result) is
+recorded as child spans. The current span is tracked in a context variable,
+which the scheduler's worker threads inherit, so no span has to be passed
+around explicitly.
+
+Finished traces can be exported to a local JSONL file (one span per line)
+and/or an OTLP/HTTP JSON collector. Any tool call slower than the configured
+threshold has its full span tree logged as a warning.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from collibra_mcp.config import (
+    SLOW_CALL_THRESHOLD_MS,
+    TRACE_FILE,
+    TRACE_OTLP_ENDPOINT,
+)
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "collibra-mcp"
+
+_current_span = contextvars.ContextVar("collibra_mcp_span", default=None)
+
+_UUID = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+
+
+class Span:
+    """A timed operation with attributes and child spans."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent", "attributes", "children",
+                 "start_ns", "duration_ns", "_started", "error")
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.attributes = dict(attributes or {})
+        self.children = []
+        self.error = None
+        self.start_ns = time.time_ns()
+        self.duration_ns = None
+        self._started = time.perf_counter_ns()
+        if parent is not None:
+            parent.children.append(self)
+
+    def finish(self):
+        self.duration_ns = time.perf_counter_ns() - self._started
+
+    @property
+    def duration_ms(self):
+        return (self.duration_ns or 0) / 1e6
+
+    def set(self, **attributes):
+        """Adds attributes to the span."""
+        self.attributes.update(attributes)
+
+    def record_response(self, response):
+        """Records status and size of a fully read ``requests`` response."""
+        self.attributes["http.status_code"] = response.status_code
+        self.attributes["http.response_bytes"] = len(response.content)
+
+    def count_bytes(self, chunks):
+        """Passes ``chunks`` through while adding their size to ``http.response_bytes``."""
+        self.attributes.setdefault("http.response_bytes", 0)
+        for chunk in chunks:
+            self.attributes["http.response_bytes"] += len(chunk)
+            yield chunk
+
+    def walk(self):
+        """Yields this span and all of its descendants, depth first."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def as_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def format_tree(self, depth=0):
+        """Returns the span tree as indented text, one span per line."""
+        attributes = " ".join(f"{key}={value}" for key, value in self.attributes.items())
+        line = f"{'  ' * depth}{self.name} {self.duration_ms:.1f} ms"
+        if attributes:
+            line += f" {attributes}"
+        if self.error:
+            line += f" error={self.error}"
+        return "\n".join([line] + [child.format_tree(depth + 1) for child in self.children])
+
+
+def current_span():
+    """Returns the span currently being recorded, or None."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Records a span around the enclosed block.
+
+    The span becomes a child of the current span, or a new root span if there
+    is none. Root spans are exported and checked against the slow-call
+    threshold when they finish.
+    """
+    parent = _current_span.get()
+    current = Span(name, parent, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.finish()
+        _current_span.reset(token)
+        if parent is None:
+            _finish_trace(current)
+
+
+def url_template(api_url, base_url=''):
+    """
+    Reduces a Collibra API URL to a low-cardinality template.
+
+    For example ``<base>/assets?domainId=1234`` becomes
+    ``/assets?domainId={domainId}`` and UUID or publicId path segments become
+    ``{id}`` / ``{publicId}``. The path of ``base_url`` is stripped.
+    """
+    parts = urlsplit(api_url)
+    base_path = urlsplit(base_url).path.rstrip('/')
+    path = parts.path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    segments = path.split('/')
+    for i, segment in enumerate(segments):
+        if _UUID.match(segment):
+            segments[i] = '{id}'
+        elif i > 0 and segments[i - 1] == 'publicId':
+            segments[i] = '{publicId}'
+    template = '/'.join(segments)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if query:
+        template += '?' + '&'.join(f'{key}={{{key}}}' for key, _ in query)
+    return template
+
+
+@contextmanager
+def http_span(method, api_url, instance):
+    """Records a span for an HTTP request to a Collibra instance."""
+    template = url_template(api_url, instance.base_url)
+    with span(f"{method} {template}", **{
+        "collibra.instance": instance.name,
+        "http.method": method,
+        "url.template": template,
+    }) as current:
+        yield current
+
+
+def traced_tool(fn):
+    """Wraps an async MCP tool so each invocation is recorded as a root span."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with span(f"tool {fn.__name__}", **{"mcp.tool": fn.__name__}):
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
+def _finish_trace(root):
+    if SLOW_CALL_THRESHOLD_MS and root.duration_ms >= SLOW_CALL_THRESHOLD_MS:
+        logger.warning(
+            f"Slow call {root.name} took {root.duration_ms:.1f} ms "
+            f"(threshold {SLOW_CALL_THRESHOLD_MS:.0f} ms)\n{root.format_tree()}"
+        )
+    if TRACE_FILE or TRACE_OTLP_ENDPOINT:
+        _exporter().put(root)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _span_kind(current):
+    # SPAN_KIND_SERVER for the tool call, CLIENT for Collibra requests, INTERNAL otherwise
+    if current.parent is None:
+        return 2
+    if "http.method" in current.attributes:
+        return 3
+    return 1
+
+
+def _otlp_payload(root):
+    spans = []
+    for current in root.walk():
+        otlp_span = {
+            "traceId": current.trace_id,
+            "spanId": current.span_id,
+            "name": current.name,
+            "kind": _span_kind(current),
+            "startTimeUnixNano": str(current.start_ns),
+            "endTimeUnixNano": str(current.start_ns + (current.duration_ns or 0)),
+            "attributes": [{"key": key, "value": _otlp_value(value)}
+                           for key, value in current.attributes.items()],
+        }
+        if current.parent is not None:
+            otlp_span["parentSpanId"] = current.parent.span_id
+        if current.error:
+            otlp_span["status"] = {"code": 2, "message": current.error}
+        spans.append(otlp_span)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "collibra_mcp"}, "spans": spans}],
+    }]}
+
+
+class _TraceExporter:
+    """Writes finished traces from a background thread so tool calls never wait on export."""
+
+    def __init__(self, trace_file, otlp_endpoint):
+        self.trace_file = trace_file
+        self.otlp_url = otlp_endpoint.rstrip('/') + '/v1/traces' if otlp_endpoint else None
+        self.queue = queue.Queue(maxsize=1000)
+        threading.Thread(target=self._run, name="collibra-mcp-tracing", daemon=True).start()
+
+    def put(self, root):
+        try:
+            self.queue.put_nowait(root)
+        except queue.Full:
+            logger.warning(f"Trace export queue full, dropping trace {root.trace_id}")
+
+    def _run(self):
+        while True:
+            root = self.queue.get()
+            try:
+                if self.trace_file:
+                    with open(self.trace_file, 'a', encoding='utf-8') as f:
+                        for current in root.walk():
+                            f.write(json.dumps(current.as_dict(), default=str) + '\n')
+                if self.otlp_url:
+                    requests.post(self.otlp_url, json=_otlp_payload(root), timeout=5)
+            except Exception as e:
+                logger.warning(f"Error exporting trace {root.trace_id}: {e}")
+
+
+_exporter_instance = None
+_exporter_lock = threading.Lock()
+
+
+def _exporter():
+    global _exporter_instance
+    with _exporter_lock:
+        if _exporter_instance is None:
+            _exporter_instance = _TraceExporter(TRACE_FILE, TRACE_OTLP_ENDPOINT)
+        return _exporter_instance
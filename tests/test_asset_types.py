@@ -0,0 +1,108 @@
+"""Tests for the asset type hierarchy."""
+
+from collibra_mcp import asset_types
+from collibra_mcp.asset_types import AssetTypeHierarchy, get_asset_type_hierarchy
+from collibra_mcp.instances import CollibraInstance, use_instance
+
+CATALOG = [
+    {"id": "a", "publicId": "Asset", "name": "Asset"},
+    {"id": "d", "publicId": "DataAsset", "name": "Data Asset", "parent": {"id": "a"}},
+    {"id": "t", "publicId": "Table", "name": "Table", "parent": {"id": "d"}},
+    {"id": "c", "publicId": "Column", "name": "Column", "parent": {"id": "d"}},
+    {"id": "b", "publicId": "BusinessAsset", "name": "Business Asset", "parent": {"id": "a"}},
+    {"id": "x", "publicId": "Other", "name": "Other"},
+]
+
+
+def make_instance():
+    return CollibraInstance("test", "http://collibra.test/rest/2.0", "user", "secret", 2)
+
+
+def test_lookup_by_id_public_id_and_name():
+    hierarchy = AssetTypeHierarchy(CATALOG)
+    assert hierarchy.get_id("t") == "t"
+    assert hierarchy.get_id("Table") == "t"
+    assert hierarchy.get_id("data asset") == "d"
+    assert hierarchy.get("Column") == {"id": "c", "publicId": "Column", "name": "Column", "parentId": "d"}
+    assert hierarchy.get("missing") is None
+
+
+def test_parent_and_children():
+    hierarchy = AssetTypeHierarchy(CATALOG)
+    assert hierarchy.parent_id("c") == "d"
+    assert hierarchy.parent_id("a") is None
+    assert hierarchy.child_ids("a") == ["d", "b"]
+    assert hierarchy.child_ids("t") == []
+
+
+def test_descendant_ids():
+    hierarchy = AssetTypeHierarchy(CATALOG)
+    assert hierarchy.descendant_ids("a") == ["a", "d", "t", "c", "b"]
+    assert hierarchy.descendant_ids("DataAsset", include_self=False) == ["t", "c"]
+    assert hierarchy.descendant_ids("x") == ["x"]
+    assert hierarchy.descendant_ids("missing") == []
+
+
+def test_is_subtype():
+    hierarchy = AssetTypeHierarchy(CATALOG)
+    assert hierarchy.is_subtype("c", "a")
+    assert hierarchy.is_subtype("d", "d")
+    assert not hierarchy.is_subtype("b", "d")
+    assert not hierarchy.is_subtype("x", "a")
+
+
+def test_expand_keeps_order_dedupes_and_passes_unknown_keys():
+    hierarchy = AssetTypeHierarchy(CATALOG)
+    assert hierarchy.expand(["Data Asset", "t", "unknown", "b"]) == ["d", "t", "c", "unknown", "b"]
+
+
+def test_hierarchy_is_cached_and_reloaded_after_ttl(monkeypatch):
+    loads = []
+
+    def fake_fetch():
+        loads.append(1)
+        return CATALOG[:len(loads) + 3]
+
+    monkeypatch.setattr(asset_types, "fetch_asset_types", fake_fetch)
+    with use_instance(make_instance()):
+        first = get_asset_type_hierarchy()
+        assert get_asset_type_hierarchy() is first
+        assert len(loads) == 1
+
+        monkeypatch.setattr(asset_types, "ASSET_TYPE_CACHE_TTL_SECONDS", 0)
+        reloaded = get_asset_type_hierarchy()
+        assert len(loads) == 2
+        assert len(reloaded) == len(first) + 1
+
+
+def test_refresh_forces_reload(monkeypatch):
+    loads = []
+    monkeypatch.setattr(asset_types, "fetch_asset_types", lambda: loads.append(1) or CATALOG)
+    with use_instance(make_instance()):
+        get_asset_type_hierarchy()
+        get_asset_type_hierarchy(refresh=True)
+    assert len(loads) == 2
+
+
+def test_load_error_is_returned_and_not_cached(monkeypatch):
+    monkeypatch.setattr(asset_types, "fetch_asset_types", lambda: {"error": "boom"})
+    instance = make_instance()
+    with use_instance(instance):
+        assert get_asset_type_hierarchy() == {"error": "boom"}
+    assert instance.asset_type_hierarchy is None
+
+
+def test_failed_reload_keeps_serving_cached_hierarchy(monkeypatch, caplog):
+    monkeypatch.setattr(asset_types, "fetch_asset_types", lambda: CATALOG)
+    instance = make_instance()
+    with use_instance(instance):
+        cached = get_asset_type_hierarchy()
+
+        monkeypatch.setattr(asset_types, "fetch_asset_types", lambda: {"error": "boom"})
+        monkeypatch.setattr(asset_types, "ASSET_TYPE_CACHE_TTL_SECONDS", 0)
+        assert get_asset_type_hierarchy() is cached
+        assert "serving the cached hierarchy" in caplog.text
+
+        # An explicit refresh reports the failure, but keeps the cache
+        assert get_asset_type_hierarchy(refresh=True) == {"error": "boom"}
+    assert instance.asset_type_hierarchy is cached
@@ -0,0 +1,86 @@
+"""Tests for multi-instance configuration and routing."""
+
+import ast
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from collibra_mcp import instances, server, tracing
+from collibra_mcp.instances import CollibraInstance, instance_for_cursor
+from collibra_mcp.records import AssetRecord
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_config(**env):
+    clean = {key: value for key, value in os.environ.items() if not key.startswith('COLLIBRA_')}
+    clean.update(env, PYTHONPATH=ROOT)
+    return subprocess.run(
+        [sys.executable, '-c', 'from collibra_mcp import config; print(config.INSTANCES)'],
+        capture_output=True, text=True, env=clean,
+    )
+
+
+def test_named_instance_requires_url_and_credentials():
+    result = load_config(COLLIBRA_INSTANCES='dev', COLLIBRA_DEV_BASE_URL='https://dev.example/rest/2.0')
+    assert result.returncode != 0
+    assert 'COLLIBRA_DEV_USN' in result.stderr
+    assert 'COLLIBRA_DEV_PW' in result.stderr
+
+
+def test_named_instance_does_not_fall_back_to_global_base_url():
+    result = load_config(COLLIBRA_INSTANCES='dev', COLLIBRA_DEV_USN='u', COLLIBRA_DEV_PW='p')
+    assert result.returncode != 0
+    assert 'COLLIBRA_DEV_BASE_URL' in result.stderr
+
+
+def test_complete_named_instances_load():
+    result = load_config(
+        COLLIBRA_INSTANCES='dev,prod',
+        COLLIBRA_DEV_BASE_URL='https://dev.example', COLLIBRA_DEV_USN='u', COLLIBRA_DEV_PW='p',
+        COLLIBRA_PROD_BASE_URL='https://prod.example', COLLIBRA_PROD_USN='u', COLLIBRA_PROD_PW='p',
+    )
+    assert result.returncode == 0, result.stderr
+    loaded = ast.literal_eval(result.stdout)
+    assert loaded['dev']['base_url'] == 'https://dev.example'
+    assert loaded['prod']['base_url'] == 'https://prod.example'
+
+
+@pytest.fixture
+def prod(monkeypatch):
+    instance = CollibraInstance('prod', 'https://prod.example/rest/2.0', 'u', 'p', 4)
+    monkeypatch.setitem(instances._instances, 'prod', instance)
+    return instance
+
+
+def call_tool(name, arguments):
+    content, _ = asyncio.run(server.mcp.call_tool(name, arguments))
+    return content[0].text
+
+
+def test_fetch_more_finds_the_instance_from_the_cursor(prod):
+    prod.result_store.page_chars = 200
+    page = ast.literal_eval(prod.result_store.paginate({'results': [AssetRecord(f'id{i}') for i in range(30)]}))
+    cursor = page['cursor']
+    assert cursor.startswith('prod:')
+    assert instance_for_cursor(cursor) is prod
+
+    # No instance argument: the cursor alone selects the prod result store
+    next_page = ast.literal_eval(call_tool('fetch_more', {'cursor': cursor}))
+    assert next_page['results'][0]['id'] == f'id{len(page["results"])}'
+
+
+def test_fetch_more_rejects_cursor_of_unknown_instance():
+    assert 'does not belong' in call_tool('fetch_more', {'cursor': 'qa:abc:3'})
+
+
+def test_root_span_carries_instance(prod, monkeypatch):
+    roots = []
+    monkeypatch.setattr(tracing, '_finish_trace', roots.append)
+    call_tool('get_scheduler_stats', {'instance': 'prod'})
+    call_tool('get_scheduler_stats', {})
+    assert roots[0].attributes['collibra.instance'] == 'prod'
+    assert roots[1].attributes['collibra.instance'] == instances.get_instance().name
@@ -0,0 +1,113 @@
+"""Tests for result cursors and paging."""
+
+import ast
+
+from collibra_mcp.records import AssetRecord
+from collibra_mcp.result_store import ResultStore
+
+
+def records(count):
+    return [AssetRecord(f"id{i}", f"name{i}") for i in range(count)]
+
+
+def parse(page):
+    # Pages are str() of a dict, errors are returned as the dict itself
+    return page if isinstance(page, dict) else ast.literal_eval(page)
+
+
+def ids(page):
+    return [record["id"] for record in page["results"]]
+
+
+def make_store(**kwargs):
+    settings = {"page_chars": 300, "ttl": 600, "max_entries": 4, "max_records": 1000}
+    settings.update(kwargs)
+    return ResultStore(**settings)
+
+
+def read_all(store, first):
+    pages = [first]
+    while "cursor" in pages[-1]:
+        pages.append(parse(store.fetch_more(pages[-1]["cursor"])))
+    return pages
+
+
+def test_small_result_is_returned_in_one_page():
+    page = parse(make_store().paginate({"total": 3, "results": records(3)}))
+    assert ids(page) == ["id0", "id1", "id2"]
+    assert "cursor" not in page and "note" not in page
+
+
+def test_pages_cover_every_record_once():
+    store = make_store()
+    pages = read_all(store, parse(store.paginate({"total": 50, "results": records(50)})))
+    assert len(pages) > 2
+    assert [i for page in pages for i in ids(page)] == [f"id{i}" for i in range(50)]
+    assert all(len(str(page["results"])) <= 300 for page in pages)
+
+
+def test_cursor_can_be_read_again():
+    store = make_store()
+    first = parse(store.paginate({"results": records(50)}))
+    second = store.fetch_more(first["cursor"])
+    assert store.fetch_more(first["cursor"]) == second
+    # Reading the last page does not remove the result
+    pages = read_all(store, first)
+    assert store.fetch_more(pages[-2]["cursor"]) == str(pages[-1])
+
+
+def test_oversized_result_is_not_stored_and_says_so():
+    store = make_store(max_records=100)
+    page = parse(store.paginate({"results": records(150)}))
+    assert "cursor" not in page
+    assert "truncated" in page["note"]
+    assert store.entries == {}
+
+
+def test_new_result_is_never_evicted_by_its_own_insertion():
+    store = make_store(max_entries=2, max_records=100)
+    cursors = [parse(store.paginate({"results": records(60)}))["cursor"] for _ in range(3)]
+    # Only the newest result fits within max_records
+    assert "error" in parse(store.fetch_more(cursors[0]))
+    assert "error" in parse(store.fetch_more(cursors[1]))
+    assert ids(parse(store.fetch_more(cursors[2])))
+
+
+def test_least_recently_used_result_is_evicted_first():
+    store = make_store(max_entries=2)
+    first = parse(store.paginate({"results": records(20)}))["cursor"]
+    second = parse(store.paginate({"results": records(20)}))["cursor"]
+    store.fetch_more(first)
+    store.paginate({"results": records(20)})
+    assert "error" not in parse(store.fetch_more(first))
+    assert "error" in parse(store.fetch_more(second))
+
+
+def test_results_expire_after_ttl():
+    store = make_store(ttl=0)
+    cursor = parse(store.paginate({"results": records(20)}))["cursor"]
+    assert "expired" in parse(store.fetch_more(cursor))["error"]
+
+
+def test_invalid_and_out_of_range_cursors():
+    store = make_store()
+    cursor = parse(store.paginate({"results": records(20)}))["cursor"]
+    result_id = cursor.split(":")[0]
+    assert "not a valid" in parse(store.fetch_more("nonsense"))["error"]
+    assert "past the end" in parse(store.fetch_more(f"{result_id}:20"))["error"]
+
+
+def test_upstream_total_is_reported_when_larger_than_fetched():
+    store = make_store()
+    pages = read_all(store, parse(store.paginate({"total": 1200, "results": records(50)})))
+    assert all("1200 in total" in page["returned"] for page in pages)
+    assert "Only 50 of 1200" in pages[-1]["note"]
+
+    single = parse(store.paginate({"total": 900, "results": records(2)}))
+    assert "Only 2 of 900" in single["note"]
+
+
+def test_non_list_and_error_results_pass_through():
+    store = make_store()
+    assert store.paginate({"error": "boom"}) == str({"error": "boom"})
+    assert store.paginate("abc") == "abc"
@@ -0,0 +1,153 @@
+"""Tests for the tool call scheduler."""
+
+import asyncio
+import threading
+
+from collibra_mcp.scheduler import BULK, TOOL_LIMITS, TOOL_PRIORITIES, Scheduler
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.001)
+
+
+def blocking(gate, name, log):
+    def fn():
+        assert gate.wait(5)
+        log.append(name)
+        return name
+    return fn
+
+
+def test_interactive_call_admitted_while_bulk_fills_its_share():
+    async def main():
+        scheduler = Scheduler(8, TOOL_LIMITS, TOOL_PRIORITIES, reserved_interactive=2)
+        gate = threading.Event()
+        log = []
+        bulk_tools = [name for name, priority in TOOL_PRIORITIES.items() if priority == BULK]
+        bulk = [
+            asyncio.create_task(scheduler.run(tool, blocking(gate, tool, log)))
+            for tool in bulk_tools for _ in range(2)
+        ]
+        try:
+            await wait_until(lambda: scheduler.running == 6)
+            # Bulk work is capped at 8 - 2 slots even though per-tool caps allow 10
+            assert scheduler.running_bulk == 6
+            assert scheduler.snapshot()["queued"] == 4
+
+            result = await asyncio.wait_for(scheduler.run("get_role_id", lambda: "role"), 1)
+            assert result == "role"
+            assert log == []
+        finally:
+            gate.set()
+            await asyncio.gather(*bulk)
+        assert scheduler.running == 0 and scheduler.running_bulk == 0
+
+    asyncio.run(main())
+
+
+def test_waiting_interactive_calls_go_before_waiting_bulk():
+    async def main():
+        scheduler = Scheduler(1, tool_priorities={"bulk": BULK})
+        gate = threading.Event()
+        log = []
+        first = asyncio.create_task(scheduler.run("lookup", blocking(gate, "first", log)))
+        await wait_until(lambda: scheduler.running == 1)
+        bulk = asyncio.create_task(scheduler.run("bulk", lambda: log.append("bulk")))
+        await asyncio.sleep(0.01)
+        lookup = asyncio.create_task(scheduler.run("lookup", lambda: log.append("lookup")))
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(first, bulk, lookup)
+        assert log == ["first", "lookup", "bulk"]
+
+    asyncio.run(main())
+
+
+def test_per_tool_limit():
+    async def main():
+        scheduler = Scheduler(4, tool_limits={"heavy": 1})
+        gate = threading.Event()
+        log = []
+        tasks = [asyncio.create_task(scheduler.run("heavy", blocking(gate, "heavy", log))) for _ in range(3)]
+        await wait_until(lambda: scheduler.running == 1)
+        await asyncio.sleep(0.01)
+        assert scheduler.running_by_tool["heavy"] == 1
+        assert await scheduler.run("light", lambda: "light") == "light"
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+
+def test_sessions_are_served_round_robin():
+    async def main():
+        scheduler = Scheduler(1)
+        gate = threading.Event()
+        log = []
+        first = asyncio.create_task(scheduler.run("t", blocking(gate, "start", log), session="a"))
+        await wait_until(lambda: scheduler.running == 1)
+        tasks = [asyncio.create_task(scheduler.run("t", lambda i=i: log.append(f"a{i}"), session="a"))
+                 for i in range(3)]
+        tasks.append(asyncio.create_task(scheduler.run("t", lambda: log.append("b0"), session="b")))
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(first, *tasks)
+        assert log == ["start", "a0", "b0", "a1", "a2"]
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_is_removed_and_slots_are_returned():
+    async def main():
+        scheduler = Scheduler(1)
+        gate = threading.Event()
+        log = []
+        first = asyncio.create_task(scheduler.run("t", blocking(gate, "first", log)))
+        await wait_until(lambda: scheduler.running == 1)
+        waiter = asyncio.create_task(scheduler.run("t", lambda: log.append("cancelled")))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.snapshot()["queued"] == 0
+
+        gate.set()
+        await first
+        assert log == ["first"]
+        assert scheduler.running == 0
+        assert await scheduler.run("t", lambda: "again") == "again"
+
+    asyncio.run(main())
+
+
+def test_waiter_cancelled_in_the_same_tick_as_a_release_is_not_admitted():
+    async def main():
+        scheduler = Scheduler(1)
+        scheduler._start("t")
+        waiter = asyncio.create_task(scheduler._acquire("t", None))
+        await asyncio.sleep(0)
+        assert scheduler.snapshot()["queued"] == 1
+        # The future is cancelled now, the waiter's own cleanup only runs on its next step
+        waiter.cancel()
+        scheduler._release("t")
+        assert scheduler.running == 0
+        assert scheduler.snapshot()["queued"] == 0
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert waiter.cancelled()
+        assert scheduler.running == 0
+        assert await asyncio.wait_for(scheduler.run("t", lambda: "again"), 1) == "again"
+
+    asyncio.run(main())
+
+
+def test_stats_separate_queue_wait_and_upstream_time():
+    async def main():
+        scheduler = Scheduler(2)
+        await scheduler.run("t", lambda: None)
+        stats = scheduler.snapshot()["tools"]["t"]
+        assert stats["calls"] == 1
+        assert {"avg_queue_wait_ms", "avg_upstream_ms", "max_queue_wait_ms", "max_upstream_ms"} <= set(stats)
+
+    asyncio.run(main())
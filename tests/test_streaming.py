@@ -0,0 +1,93 @@
+"""Tests for incremental JSON parsing and compact records."""
+
+import json
+
+import pytest
+
+from collibra_mcp.records import AssetRecord, RelationRecord, SearchRecord
+from collibra_mcp.streaming import iter_json_results
+
+ENVELOPE = {
+    "total": 3,
+    "offset": 0,
+    "results": [
+        {"id": "é1", "score": 1.5e3, "nested": [1, 2, {"a": None}], "flag": True},
+        {"id": "2", "name": "with \"quotes\" and , ] } chars"},
+        12345,
+    ],
+    "limit": 0,
+}
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64, 10000])
+def test_results_survive_any_chunk_boundary(size):
+    # Size 1 splits every token, including multi-byte UTF-8 characters and numbers
+    raw = json.dumps(ENVELOPE, ensure_ascii=False).encode()
+    metadata = {}
+    assert list(iter_json_results(chunked(raw, size), metadata)) == ENVELOPE["results"]
+    assert metadata == {"total": 3, "offset": 0, "limit": 0}
+
+
+def test_number_split_across_chunks_is_not_truncated():
+    assert list(iter_json_results([b'{"results": [12', b'345, 6', b'7]}'])) == [12345, 67]
+
+
+def test_yields_before_the_body_is_complete():
+    def chunks():
+        yield b'{"results": [{"id": 1}, '
+        raise AssertionError("read past the first record")
+
+    assert next(iter_json_results(chunks())) == {"id": 1}
+
+
+def test_bare_array_and_empty_bodies():
+    assert list(iter_json_results([b' [1, 2 ,3] '])) == [1, 2, 3]
+    assert list(iter_json_results([b'{}'])) == []
+    assert list(iter_json_results([b'{"total": 0, "results": []}'])) == []
+
+
+def test_truncated_body_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_results([b'{"results": [{"id": 1}, {"id"']))
+
+
+def test_asset_record_flattens_references():
+    record = AssetRecord.from_json({
+        "id": "a1",
+        "name": "orders",
+        "displayName": "orders",
+        "type": {"id": "t1", "name": "Table", "resourceType": "AssetType"},
+        "domain": {"id": "d1", "name": "Warehouse"},
+        "status": {"id": "s1", "name": "Candidate"},
+        "createdBy": "u1",
+    })
+    assert record.as_dict() == {
+        "id": "a1",
+        "name": "orders",
+        "type_id": "t1",
+        "type_name": "Table",
+        "domain_id": "d1",
+        "domain_name": "Warehouse",
+        "status": "Candidate",
+    }
+    assert not hasattr(record, "__dict__")
+    assert repr(record) == repr(record.as_dict())
+
+
+def test_relation_and_search_records():
+    relation = RelationRecord.from_json({
+        "id": "r1",
+        "type": {"id": "rt"},
+        "source": {"id": "s", "name": "src"},
+        "target": {"id": "t", "name": "dst"},
+    })
+    assert relation.as_dict() == {
+        "id": "r1", "type_id": "rt", "source_id": "s", "source_name": "src",
+        "target_id": "t", "target_name": "dst",
+    }
+    hit = SearchRecord.from_json({"resource": {"id": "a", "name": "x", "resourceType": "Asset"}})
+    assert hit.as_dict() == {"id": "a", "name": "x", "resource_type": "Asset"}
@@ -0,0 +1,145 @@
+"""Tests for tracing spans, URL templates and trace export."""
+
+import asyncio
+import json
+import time
+
+import anyio
+import pytest
+
+from collibra_mcp import tracing
+from collibra_mcp.scheduler import Scheduler
+from collibra_mcp.tracing import Span, _otlp_payload, _TraceExporter, span, url_template
+
+BASE_URL = "https://collibra.example/rest/2.0"
+UUID = "0195a7a3-8f1c-7b2e-9d4f-3c6a1b2e5f70"
+
+
+@pytest.fixture
+def roots(monkeypatch):
+    finished = []
+    monkeypatch.setattr(tracing, "_finish_trace", finished.append)
+    return finished
+
+
+def make_trace():
+    root = Span("tool get_asset", attributes={"mcp.tool": "get_asset"})
+    request = Span("GET /assets/{id}", root, {"http.method": "GET", "http.status_code": 200})
+    parse = Span("json.parse", request, {"stream": True})
+    parse.error = "ValueError: bad json"
+    for current in (parse, request, root):
+        current.finish()
+    return root, request, parse
+
+
+def test_url_template_strips_base_path_and_replaces_ids():
+    assert url_template(f"{BASE_URL}/assets/{UUID}", BASE_URL) == "/assets/{id}"
+    assert url_template(f"{BASE_URL}/assetTypes/publicId/BusinessTerm", BASE_URL) == \
+        "/assetTypes/publicId/{publicId}"
+    assert url_template(f"{BASE_URL}/relations/{UUID.upper()}/source", BASE_URL) == "/relations/{id}/source"
+
+
+def test_url_template_replaces_query_values():
+    url = f"{BASE_URL}/assets?domainId={UUID}&name=Customer%20Id&offset=0&limit="
+    assert url_template(url, BASE_URL) == \
+        "/assets?domainId={domainId}&name={name}&offset={offset}&limit={limit}"
+    # Without a base URL only the host is dropped
+    assert url_template(f"{BASE_URL}/assets") == "/rest/2.0/assets"
+
+
+def test_slow_call_warning_fires_at_threshold(monkeypatch, caplog):
+    monkeypatch.setattr(tracing, "TRACE_FILE", None)
+    monkeypatch.setattr(tracing, "TRACE_OTLP_ENDPOINT", None)
+    monkeypatch.setattr(tracing, "SLOW_CALL_THRESHOLD_MS", 100)
+    root, _, _ = make_trace()
+
+    root.duration_ns = 99_999_999
+    tracing._finish_trace(root)
+    assert "Slow call" not in caplog.text
+
+    root.duration_ns = 100_000_000
+    tracing._finish_trace(root)
+    assert "Slow call tool get_asset took 100.0 ms" in caplog.text
+    # The full span tree is logged, indented by depth
+    assert "\n  GET /assets/{id}" in caplog.text
+    assert "\n    json.parse" in caplog.text and "error=ValueError: bad json" in caplog.text
+
+
+def test_slow_call_warning_is_disabled_by_zero_threshold(monkeypatch, caplog):
+    monkeypatch.setattr(tracing, "TRACE_FILE", None)
+    monkeypatch.setattr(tracing, "TRACE_OTLP_ENDPOINT", None)
+    monkeypatch.setattr(tracing, "SLOW_CALL_THRESHOLD_MS", 0)
+    root, _, _ = make_trace()
+    root.duration_ns = 60_000_000_000
+    tracing._finish_trace(root)
+    assert "Slow call" not in caplog.text
+
+
+def test_jsonl_export_writes_one_line_per_span(tmp_path):
+    trace_file = tmp_path / "traces.jsonl"
+    root, request, parse = make_trace()
+    _TraceExporter(str(trace_file), None).put(root)
+
+    deadline = time.monotonic() + 2
+    while not (trace_file.exists() and len(trace_file.read_text().splitlines()) == 3):
+        assert time.monotonic() < deadline, "trace was not exported"
+        time.sleep(0.01)
+
+    lines = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    assert [line["name"] for line in lines] == [root.name, request.name, parse.name]
+    assert [line["parent_id"] for line in lines] == [None, root.span_id, request.span_id]
+    assert {line["trace_id"] for line in lines} == {root.trace_id}
+    assert lines[2]["error"] == "ValueError: bad json"
+
+
+def test_otlp_payload_kinds_parents_and_status():
+    root, request, parse = make_trace()
+    payload = _otlp_payload(root)
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": tracing.SERVICE_NAME}
+    spans = {s["name"]: s for s in resource_spans["scopeSpans"][0]["spans"]}
+
+    # SERVER for the tool call, CLIENT for Collibra requests, INTERNAL otherwise
+    assert [spans[s.name]["kind"] for s in (root, request, parse)] == [2, 3, 1]
+    assert "parentSpanId" not in spans[root.name]
+    assert spans[request.name]["parentSpanId"] == root.span_id
+    assert spans[parse.name]["parentSpanId"] == request.span_id
+
+    assert "status" not in spans[request.name]
+    assert spans[parse.name]["status"] == {"code": 2, "message": "ValueError: bad json"}
+
+    attributes = {a["key"]: a["value"] for a in spans[request.name]["attributes"]}
+    assert attributes["http.status_code"] == {"intValue": "200"}
+    assert {a["key"]: a["value"] for a in spans[parse.name]["attributes"]} == {"stream": {"boolValue": True}}
+    assert int(spans[root.name]["endTimeUnixNano"]) >= int(spans[root.name]["startTimeUnixNano"])
+
+
+def test_span_records_error_and_finishes_root(roots):
+    with pytest.raises(KeyError):
+        with span("tool broken"):
+            with span("child"):
+                raise KeyError("x")
+    assert len(roots) == 1
+    assert roots[0].error == roots[0].children[0].error == "KeyError: 'x'"
+    assert tracing.current_span() is None
+
+
+def test_worker_thread_spans_attach_to_the_root_span(roots):
+    def work():
+        with span("GET /assets", **{"http.method": "GET"}):
+            with span("json.parse"):
+                pass
+        return tracing.current_span()
+
+    async def main():
+        with span("tool get_collibra_assets") as root:
+            # A plain anyio worker thread, and one admitted through the scheduler
+            assert await anyio.to_thread.run_sync(work) is root
+            assert await Scheduler(2).run("get_collibra_assets", work) is root
+        return root
+
+    root = asyncio.run(main())
+    assert roots == [root]
+    assert [child.name for child in root.children] == ["GET /assets", "scheduler.wait", "GET /assets"]
+    assert [child.name for child in root.children[0].children] == ["json.parse"]
+    assert {s.trace_id for s in root.walk()} == {root.trace_id}